@@ -1,6 +1,7 @@
 """
 Gap analysis API endpoints.
 """
+import asyncio
 import time
 from datetime import datetime
 from typing import Optional
@@ -130,7 +131,7 @@ async def analyze_gap_from_text(request: AnalyzeGapFromTextRequest):
         if not file_info:
             raise HTTPException(status_code=404, detail=f"Resume file {request.resume_id} not found")
         
-        text = file_info.get("parsed_text") or file_info.get("content", "")
+        text = await asyncio.to_thread(file_storage.get_parsed_text, request.resume_id) or file_info.get("content", "")
         if isinstance(text, bytes):
             text = text.decode("utf-8", errors="ignore")
         
@@ -162,7 +163,7 @@ async def analyze_gap_from_text(request: AnalyzeGapFromTextRequest):
         if not file_info:
             raise HTTPException(status_code=404, detail=f"Job description file {request.jd_id} not found")
         
-        text = file_info.get("parsed_text") or file_info.get("content", "")
+        text = await asyncio.to_thread(file_storage.get_parsed_text, request.jd_id) or file_info.get("content", "")
         if isinstance(text, bytes):
             text = text.decode("utf-8", errors="ignore")
         
@@ -1,23 +1,36 @@
 """
 Authentication API endpoints.
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+import asyncio
+import hashlib
+import hmac
+import logging
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, Response, status
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import ORJSONResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
-from pydantic import BaseModel, EmailStr
-from typing import Optional
-from app.models.database import get_db, init_db
+from pydantic import BaseModel, ConfigDict, EmailStr, TypeAdapter, ValidationError
+from typing import Any, Callable, Dict, Optional, Type
+from app.models.database import get_db
 from app.services.auth_service import (
     create_user,
-    authenticate_user,
+    get_password_hash,
+    run_password_task,
+    verify_password_for,
+    password_needs_rehash,
+    upgrade_password_hash,
     create_or_get_google_user,
     create_access_token,
     verify_token,
-    get_user_by_id,
+    get_user_projection,
+    invalidate_user_cache,
     get_user_by_email,
     set_verification_code,
     verify_user_email
 )
+from app.services.attempt_limiter import FailedAttemptLimiter, login_limiter, verify_email_limiter
+from app.services.google_token_verifier import verify_google_id_token
 from app.services.email_service import (
     generate_verification_code,
     send_verification_email,
@@ -26,58 +39,159 @@ from app.services.email_service import (
 )
 from app.config import settings
 from app.utils.password_validation import validate_password
-from google.oauth2 import id_token
-from google.auth.transport import requests
+from app.utils.http_cache import etag_matches
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 security = HTTPBearer(auto_error=False)  # Don't auto-raise error, let us handle it
 
-# Initialize database on startup
-init_db()
-
 
 # Request/Response models
 class SignupRequest(BaseModel):
+    model_config = ConfigDict(extra="forbid", populate_by_name=True)
+    
     email: EmailStr
     password: str
     full_name: Optional[str] = None
 
 
 class VerifyEmailRequest(BaseModel):
+    model_config = ConfigDict(extra="forbid", populate_by_name=True)
+    
     email: EmailStr
     code: str
 
 
 class ResendVerificationRequest(BaseModel):
+    model_config = ConfigDict(extra="forbid", populate_by_name=True)
+    
     email: EmailStr
 
 
 class LoginRequest(BaseModel):
+    model_config = ConfigDict(extra="forbid", populate_by_name=True)
+    
     email: EmailStr
     password: str
 
 
 class GoogleAuthRequest(BaseModel):
+    model_config = ConfigDict(extra="forbid", populate_by_name=True)
+    
     id_token: str
 
 
+# Response models are frozen: they are built once per request and never mutated
+class UserInfo(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="forbid", populate_by_name=True)
+    
+    id: int
+    email: str
+    full_name: Optional[str]
+    auth_provider: str
+
+
 class TokenResponse(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="forbid", populate_by_name=True)
+    
     access_token: str
     token_type: str = "bearer"
-    user: dict
+    user: UserInfo
 
 
 class SignupResponse(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="forbid", populate_by_name=True)
+    
     message: str
     email: str
     requires_verification: bool = True
 
 
-class UserResponse(BaseModel):
-    id: int
-    email: str
-    full_name: Optional[str]
-    auth_provider: str
+class UserResponse(UserInfo):
+    pass
+
+
+def trusted_response(model: BaseModel) -> ORJSONResponse:
+    """
+    Serialize a response model we built ourselves from database rows.
+    
+    FastAPI passes Response objects through untouched, so this skips the
+    dump/re-validate pass it runs against response_model. Routes keep
+    response_model= for the OpenAPI schema.
+    """
+    return ORJSONResponse(model.model_dump())
+
+
+def _token_response(user) -> ORJSONResponse:
+    """
+    Issue an access token for a user loaded from our database.
+    
+    The fields come straight from the users table, so model_construct()
+    skips re-validating them.
+    """
+    # JWT 'sub' field must be a string
+    access_token = create_access_token(data={"sub": str(user.id)})
+    return trusted_response(TokenResponse.model_construct(
+        access_token=access_token,
+        token_type="bearer",
+        user=UserInfo.model_construct(
+            id=user.id,
+            email=user.email,
+            full_name=user.full_name,
+            auth_provider=user.auth_provider
+        )
+    ))
+
+
+def json_body(model: Type[BaseModel]) -> Callable:
+    """
+    Build a dependency that validates the raw JSON body with a prebuilt TypeAdapter.
+    
+    pydantic-core parses and validates the bytes in one pass, skipping the
+    intermediate json.loads() dict FastAPI builds for regular body params.
+    Errors are re-raised as RequestValidationError so clients still get a 422.
+    """
+    adapter = TypeAdapter(model)
+    
+    async def dependency(request: Request):
+        try:
+            return adapter.validate_json(await request.body())
+        except ValidationError as e:
+            errors = e.errors(include_url=False)
+            for error in errors:
+                error["loc"] = ("body", *error["loc"])
+                if isinstance(error.get("input"), bytes):
+                    # Malformed JSON echoes the raw body, which isn't serializable
+                    error.pop("input")
+            raise RequestValidationError(errors)
+    
+    return dependency
+
+
+def json_body_openapi(model: Type[BaseModel]) -> Dict[str, Any]:
+    """Describe a json_body() model in the OpenAPI schema."""
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": model.model_json_schema()}},
+        }
+    }
+
+
+def _client_ip(http_request: Request) -> str:
+    """Best-effort client address for rate limiting."""
+    return http_request.client.host if http_request.client else "unknown"
+
+
+def _reject_if_throttled(limiter: FailedAttemptLimiter, key: tuple) -> None:
+    """Refuse requests from callers that keep failing, before any hashing or lookups."""
+    if limiter.is_blocked(key):
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many failed attempts. Please try again later.",
+            headers={"Retry-After": str(int(limiter.window_seconds))},
+        )
 
 
 def get_current_user(
@@ -87,7 +201,7 @@ def get_current_user(
     """Dependency to get current authenticated user."""
     try:
         if not credentials:
-            print("get_current_user: No credentials provided (HTTPBearer returned None)")
+            logger.debug("get_current_user: No credentials provided (HTTPBearer returned None)")
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="No authentication token provided",
@@ -95,7 +209,7 @@ def get_current_user(
             )
         token = credentials.credentials
         if not token:
-            print("get_current_user: No token provided in credentials")
+            logger.debug("get_current_user: No token provided in credentials")
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="No authentication token provided",
@@ -104,7 +218,7 @@ def get_current_user(
         
         payload = verify_token(token)
         if payload is None:
-            print(f"get_current_user: Token verification failed for token: {token[:20]}...")
+            logger.debug("get_current_user: Token verification failed")
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid authentication credentials",
@@ -113,7 +227,7 @@ def get_current_user(
         # JWT 'sub' field is stored as string, convert back to int
         user_id_str = payload.get("sub")
         if user_id_str is None:
-            print("get_current_user: No user_id in token payload")
+            logger.debug("get_current_user: No user_id in token payload")
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid authentication credentials",
@@ -121,23 +235,23 @@ def get_current_user(
         try:
             user_id: int = int(user_id_str)
         except (ValueError, TypeError):
-            print(f"get_current_user: Invalid user_id format in token: {user_id_str}")
+            logger.debug("get_current_user: Invalid user_id format in token: %r", user_id_str)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid authentication credentials",
             )
-        user = get_user_by_id(db, user_id)
+        user = get_user_projection(db, user_id)
         if user is None:
-            print(f"get_current_user: User not found for user_id: {user_id}")
+            logger.debug("get_current_user: User not found for user_id: %s", user_id)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="User not found",
             )
-        return {"id": user.id, "email": user.email, "full_name": user.full_name, "auth_provider": user.auth_provider}
+        return user
     except HTTPException:
         raise
     except Exception as e:
-        print(f"get_current_user: Unexpected error: {str(e)}")
+        logger.warning("get_current_user: Unexpected error: %s", e)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=f"Authentication error: {str(e)}",
@@ -145,7 +259,11 @@ def get_current_user(
 
 
 @router.post("/signup", response_model=SignupResponse)
-async def signup(request: SignupRequest, db: Session = Depends(get_db)):
+async def signup(
+    request: SignupRequest,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db)
+):
     """Register a new user with email and password. Sends verification code."""
     # Validate password with strong requirements
     is_valid, errors = validate_password(
@@ -162,42 +280,42 @@ async def signup(request: SignupRequest, db: Session = Depends(get_db)):
             detail=errors[0] if errors else "Password does not meet security requirements"
         )
     
-    # Check if user already exists
+    # Check if user already exists; a verified account is rejected before paying for a hash
     existing_user = get_user_by_email(db, request.email)
+    if existing_user and existing_user.email_verified:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered"
+        )
+    
+    # Hash off the event loop, only once the account will actually be created or updated
+    hashed_password = await run_password_task(get_password_hash, request.password)
+    
     if existing_user:
-        if existing_user.email_verified:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Email already registered"
-            )
-        else:
-            # User exists but not verified - update password and resend code
-            from app.services.auth_service import get_password_hash
-            existing_user.hashed_password = get_password_hash(request.password)
-            if request.full_name:
-                existing_user.full_name = request.full_name
-            db.commit()
-            user = existing_user
+        # User exists but not verified - update password and resend code
+        existing_user.hashed_password = hashed_password
+        if request.full_name:
+            existing_user.full_name = request.full_name
+        user = existing_user
     else:
         # Create new unverified user
-        user = create_user(db, request.email, request.password, request.full_name, email_verified=False)
+        user = create_user(
+            db, request.email, hashed_password, request.full_name,
+            email_verified=False, already_hashed=True, commit=False
+        )
     
     # Generate verification code
     verification_code = generate_verification_code()
     expires_at = get_verification_code_expiry()
     
-    # Store verification code
-    set_verification_code(db, user, verification_code, expires_at)
-    
-    # Send verification email
-    email_sent = send_verification_email(user.email, verification_code)
+    # Store verification code; the user row and the code go out in one commit
+    set_verification_code(db, user, verification_code, expires_at, commit=False)
+    db.commit()
+    invalidate_user_cache(user.id)
     
-    if not email_sent and not settings.debug:
-        # If email failed and not in debug mode, raise error
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to send verification email. Please try again later."
-        )
+    # Send verification email after the response (SMTP runs in the threadpool;
+    # delivery failures are logged by the email service)
+    background_tasks.add_task(send_verification_email, user.email, verification_code)
     
     return SignupResponse(
         message="Registration successful! Please check your email for the verification code.",
@@ -206,69 +324,68 @@ async def signup(request: SignupRequest, db: Session = Depends(get_db)):
     )
 
 
-@router.post("/login", response_model=TokenResponse)
-async def login(request: LoginRequest, db: Session = Depends(get_db)):
+@router.post("/login", response_model=TokenResponse, openapi_extra=json_body_openapi(LoginRequest))
+async def login(
+    http_request: Request,
+    request: LoginRequest = Depends(json_body(LoginRequest)),
+    db: Session = Depends(get_db)
+):
     """Login with email and password."""
-    print(f"[LOGIN] Login attempt for email: {request.email}")
+    logger.debug("Login attempt for email: %s", request.email)
     
-    # Normalize email (authenticate_user already does this, but we do it here for consistency)
+    # Normalize email
     email_lower = request.email.lower().strip()
-    print(f"[LOGIN] Normalized email: {email_lower}")
-    
-    # Check if user exists first
-    user_by_email = get_user_by_email(db, email_lower)
-    if user_by_email:
-        print(f"[LOGIN] User found: {user_by_email.email}, has_password: {user_by_email.hashed_password is not None}, auth_provider: {user_by_email.auth_provider}")
-        if not user_by_email.hashed_password:
-            print(f"[LOGIN] User has no password - created via Google OAuth")
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="This account was created with Google. Please sign in with Google instead.",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-        # Check if email is verified
-        if not user_by_email.email_verified:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Email not verified. Please check your email for the verification code.",
-            )
-    else:
-        print(f"[LOGIN] User not found in database")
     
-    # Authenticate user (this checks email, password, and if user has password)
-    print(f"[LOGIN] Attempting authentication...")
-    user = authenticate_user(db, email_lower, request.password, require_verified=True)
+    throttle_key = (_client_ip(http_request), email_lower)
+    _reject_if_throttled(login_limiter, throttle_key)
+    
+    # Single lookup; every failure branch below works off this record
+    user = get_user_by_email(db, email_lower)
     if not user:
-        print(f"[LOGIN] Authentication failed - incorrect credentials")
-        # Check if user exists to give better error message
-        user_exists = get_user_by_email(db, email_lower)
-        if not user_exists:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Account not found. Please sign up first.",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Incorrect email or password",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
+        logger.debug("Login failed: user not found")
+        login_limiter.record_failure(throttle_key)
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Account not found. Please sign up first.",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     
-    print(f"[LOGIN] Authentication successful for user: {user.email}")
+    logger.debug(
+        "User found: %s, has_password: %s, auth_provider: %s",
+        user.email, user.hashed_password is not None, user.auth_provider
+    )
+    if not user.hashed_password:
+        logger.debug("Login failed: user has no password - created via Google OAuth")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="This account was created with Google. Please sign in with Google instead.",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    # Check if email is verified
+    if not user.email_verified:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Email not verified. Please check your email for the verification code.",
+        )
     
-    # Create token - JWT 'sub' field must be a string
-    access_token = create_access_token(data={"sub": str(user.id)})
+    # Password hashing runs on the bounded password pool so it doesn't block the event loop
+    password_valid = await run_password_task(verify_password_for, user, request.password)
+    if not password_valid:
+        logger.debug("Login failed: incorrect credentials for %s", email_lower)
+        login_limiter.record_failure(throttle_key)
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Incorrect email or password",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     
-    return TokenResponse(
-        access_token=access_token,
-        user={
-            "id": user.id,
-            "email": user.email,
-            "full_name": user.full_name,
-            "auth_provider": user.auth_provider
-        }
-    )
+    if password_needs_rehash(user.hashed_password):
+        await run_password_task(upgrade_password_hash, db, user, request.password)
+    
+    login_limiter.reset(throttle_key)
+    logger.info("Login successful for user: %s", user.email)
+    
+    return _token_response(user)
 
 
 @router.post("/google", response_model=TokenResponse)
@@ -279,11 +396,8 @@ async def google_auth(request: GoogleAuthRequest, db: Session = Depends(get_db))
         # Use Google Client ID for verification if available
         CLIENT_ID = settings.google_client_id if settings.google_client_id else None
         
-        idinfo = id_token.verify_oauth2_token(
-            request.id_token,
-            requests.Request(),
-            CLIENT_ID
-        )
+        # RS256 check and any cert refresh are blocking, so keep them off the event loop
+        idinfo = await asyncio.to_thread(verify_google_id_token, request.id_token, CLIENT_ID)
         
         # Extract user info from Google token
         google_id = idinfo.get('sub')
@@ -299,18 +413,7 @@ async def google_auth(request: GoogleAuthRequest, db: Session = Depends(get_db))
         # Create or get user
         user = create_or_get_google_user(db, google_id, email, name)
         
-        # Create access token - JWT 'sub' field must be a string
-        access_token = create_access_token(data={"sub": str(user.id)})
-        
-        return TokenResponse(
-            access_token=access_token,
-            user={
-                "id": user.id,
-                "email": user.email,
-                "full_name": user.full_name,
-                "auth_provider": user.auth_provider
-            }
-        )
+        return _token_response(user)
         
     except ValueError as e:
         # Invalid token
@@ -325,16 +428,46 @@ async def google_auth(request: GoogleAuthRequest, db: Session = Depends(get_db))
         )
 
 
-@router.get("/me", response_model=UserResponse)
-async def get_current_user_info(current_user: dict = Depends(get_current_user)):
-    """Get current authenticated user information."""
-    return UserResponse(**current_user)
+def _user_etag(user: dict) -> str:
+    """ETag for a user's /me representation; changes whenever the users row is updated."""
+    digest = hashlib.md5(f"{user['id']}:{user['updated_at']}".encode("utf-8"), usedforsecurity=False)
+    return f'"{digest.hexdigest()}"'
 
 
-@router.post("/verify-email", response_model=TokenResponse)
-async def verify_email(request: VerifyEmailRequest, db: Session = Depends(get_db)):
+@router.get("/me", response_model=UserResponse)
+async def get_current_user_info(http_request: Request, current_user: dict = Depends(get_current_user)):
+    """
+    Get current authenticated user information.
+    
+    Clients polling with If-None-Match get a bare 304 while the user is unchanged.
+    """
+    etag = _user_etag(current_user)
+    cache_headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(http_request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers)
+    
+    response = trusted_response(UserResponse.model_construct(
+        id=current_user["id"],
+        email=current_user["email"],
+        full_name=current_user["full_name"],
+        auth_provider=current_user["auth_provider"]
+    ))
+    response.headers.update(cache_headers)
+    return response
+
+
+@router.post("/verify-email", response_model=TokenResponse, openapi_extra=json_body_openapi(VerifyEmailRequest))
+async def verify_email(
+    http_request: Request,
+    request: VerifyEmailRequest = Depends(json_body(VerifyEmailRequest)),
+    db: Session = Depends(get_db)
+):
     """Verify user email with verification code."""
     email_lower = request.email.lower().strip()
+    
+    throttle_key = (_client_ip(http_request), email_lower)
+    _reject_if_throttled(verify_email_limiter, throttle_key)
+    
     user = get_user_by_email(db, email_lower)
     
     if not user:
@@ -349,8 +482,11 @@ async def verify_email(request: VerifyEmailRequest, db: Session = Depends(get_db
             detail="Email already verified"
         )
     
-    # Check if code matches
-    if not user.verification_code or user.verification_code != request.code:
+    # Check if code matches (constant-time; bytes so non-ASCII input can't raise)
+    if not user.verification_code or not hmac.compare_digest(
+        user.verification_code.encode('utf-8'), request.code.encode('utf-8')
+    ):
+        verify_email_limiter.record_failure(throttle_key)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid verification code"
@@ -365,23 +501,17 @@ async def verify_email(request: VerifyEmailRequest, db: Session = Depends(get_db
     
     # Verify user email
     verify_user_email(db, user)
+    verify_email_limiter.reset(throttle_key)
     
-    # Create token - JWT 'sub' field must be a string
-    access_token = create_access_token(data={"sub": str(user.id)})
-    
-    return TokenResponse(
-        access_token=access_token,
-        user={
-            "id": user.id,
-            "email": user.email,
-            "full_name": user.full_name,
-            "auth_provider": user.auth_provider
-        }
-    )
+    return _token_response(user)
 
 
 @router.post("/resend-verification")
-async def resend_verification(request: ResendVerificationRequest, db: Session = Depends(get_db)):
+async def resend_verification(
+    request: ResendVerificationRequest,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db)
+):
     """Resend verification code to user's email."""
     email_lower = request.email.lower().strip()
     user = get_user_by_email(db, email_lower)
@@ -405,14 +535,8 @@ async def resend_verification(request: ResendVerificationRequest, db: Session =
     # Store verification code
     set_verification_code(db, user, verification_code, expires_at)
     
-    # Send verification email
-    email_sent = send_verification_email(user.email, verification_code)
-    
-    if not email_sent and not settings.debug:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to send verification email. Please try again later."
-        )
+    # Send verification email after the response
+    background_tasks.add_task(send_verification_email, user.email, verification_code)
     
     return {
         "message": "Verification code has been sent to your email.",
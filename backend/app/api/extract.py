@@ -7,7 +7,9 @@ from concurrent.futures import ThreadPoolExecutor
 from fastapi import APIRouter, HTTPException
 from app.models.api_models import ExtractSkillsRequest, ExtractSkillsResponse
 from app.models.schemas import SkillExtractionResult
+from app.api.parse import ensure_parsed
 from app.services.unified_extraction import unified_skill_extractor
+from app.utils.file_storage import file_storage
 
 router = APIRouter()
 
@@ -92,6 +94,16 @@ async def extract_skills(request: ExtractSkillsRequest):
         except Exception as e:
             return None, str(e)
     
+    # Parse both uploads up front so their text is extracted in separate worker
+    # processes; extract_from_file_id then finds the text already stored.
+    # Missing files are left for extraction to report.
+    if request.resume_id and request.jd_id:
+        await asyncio.gather(*(
+            ensure_parsed(file_id, file_data)
+            for file_id in (request.resume_id, request.jd_id)
+            if (file_data := file_storage.get_file(file_id))
+        ))
+    
     # Run both extractions in parallel
     tasks = []
     
@@ -2,8 +2,16 @@
 File parsing API endpoints.
 """
 import asyncio
+from typing import Dict, Optional, Tuple
 from fastapi import APIRouter, HTTPException
-from app.services.file_parser import file_parser_service
+from fastapi.responses import ORJSONResponse
+from app.services.file_parser import (
+    cache_extracted_text,
+    extract_text_in_worker,
+    extracted_text_cache_key,
+    get_cached_text,
+    parse_pool
+)
 from app.utils.file_storage import file_storage
 
 router = APIRouter()
@@ -11,50 +19,62 @@ router = APIRouter()
 # Timeout for parsing operations (60 seconds)
 PARSE_TIMEOUT = 60
 
+# Parses currently running, keyed by file_id, so concurrent requests share one result.
+# Only touched from the event loop thread, so no lock is required.
+_inflight_parses: Dict[str, asyncio.Future] = {}
 
-@router.post("/parse/{file_id}")
-async def parse_file(file_id: str):
+
+async def _run_parse(file_id: str, file_type: str, content: bytes) -> Tuple[bool, Optional[str]]:
+    """Extract text in the process pool and store it in the main process."""
+    # Identical content parsed earlier skips the process pool
+    cache_key = extracted_text_cache_key(file_type, content)
+    extracted_text = get_cached_text(cache_key)
+    if extracted_text is None:
+        loop = asyncio.get_running_loop()
+        # Extraction runs in worker processes; the text is stored back here
+        extracted_text, error = await loop.run_in_executor(
+            parse_pool,
+            extract_text_in_worker,
+            file_type,
+            content
+        )
+        
+        if error:
+            return False, error
+        cache_extracted_text(cache_key, extracted_text)
+    
+    file_storage.update_file_text(file_id, extracted_text)
+    return True, None
+
+
+async def ensure_parsed(file_id: str, file_data: dict) -> None:
     """
-    Parse an uploaded file and extract text.
-    Uses asyncio to run parsing in a thread pool to avoid blocking.
-    Has a timeout to prevent hanging on large files.
+    Parse a stored upload unless its text is already available.
+    
+    Concurrent callers for the same file share one parse. Failures are
+    raised as the HTTPExceptions the parse endpoint returns.
     
     Args:
         file_id: Unique file identifier
-        
-    Returns:
-        Parsing result with extracted text length
+        file_data: The file's metadata entry from file_storage
     """
-    # Check if file exists
-    file_data = file_storage.get_file(file_id)
+    if file_data["parsed_text_length"] is not None:
+        return
     
-    if not file_data:
-        raise HTTPException(
-            status_code=404,
-            detail="File not found or session expired"
-        )
-    
-    # Check if already parsed
-    if file_data.get("parsed_text"):
-        parsed_text = file_data["parsed_text"]
-        return {
-            "file_id": file_id,
-            "status": "success",
-            "text_length": len(parsed_text),
-            "filename": file_data["filename"],
-            "file_type": file_data["file_type"],
-            "preview": parsed_text[:500] if len(parsed_text) > 500 else parsed_text,
-        }
-    
-    # Run parsing in thread pool with timeout to avoid blocking the event loop
+    # Run parsing in the process pool with timeout to avoid blocking the event loop.
+    # A second request for the same file awaits the parse already in flight.
     try:
-        loop = asyncio.get_event_loop()
+        future = _inflight_parses.get(file_id)
+        if future is None:
+            future = asyncio.ensure_future(
+                _run_parse(file_id, file_data["file_type"], file_data["content"])
+            )
+            _inflight_parses[file_id] = future
+            future.add_done_callback(lambda _: _inflight_parses.pop(file_id, None))
+        
+        # shield() keeps one caller's timeout from cancelling the shared parse
         success, error_message = await asyncio.wait_for(
-            loop.run_in_executor(
-                None,
-                file_parser_service.parse_file,
-                file_id
-            ),
+            asyncio.shield(future),
             timeout=PARSE_TIMEOUT
         )
     except asyncio.TimeoutError:
@@ -74,28 +94,56 @@ async def parse_file(file_id: str):
             detail=error_message or "Failed to parse file"
         )
     
-    # Get updated file data
-    updated_file_data = file_storage.get_file(file_id)
-    
-    if not updated_file_data or not updated_file_data.get("parsed_text"):
+    # Parsing updates this same metadata entry in place, so no second lookup is needed
+    if file_data["parsed_text_length"] is None:
         raise HTTPException(
             status_code=500,
             detail="File parsed but text not available"
         )
+
+
+@router.post("/parse/{file_id}")
+async def parse_file(file_id: str):
+    """
+    Parse an uploaded file and extract text.
+    Runs parsing in a process pool so concurrent parses use every core.
+    Has a timeout to prevent hanging on large files.
+    
+    Args:
+        file_id: Unique file identifier
+        
+    Returns:
+        Parsing result with extracted text length
+    """
+    # Check if file exists
+    file_data = file_storage.get_file(file_id)
+    
+    if not file_data:
+        raise HTTPException(
+            status_code=404,
+            detail="File not found or session expired"
+        )
     
-    parsed_text = updated_file_data["parsed_text"]
+    # Parse unless already parsed (joining a parse already in flight)
+    await ensure_parsed(file_id, file_data)
     
+    preview = await asyncio.to_thread(file_storage.get_parsed_preview, file_id, 500)
+    return _parse_result(file_id, file_data, preview)
+
+
+def _parse_result(file_id: str, file_data: dict, preview: Optional[str]) -> dict:
+    """Build the parse response from the file metadata and its text preview."""
     return {
         "file_id": file_id,
         "status": "success",
-        "text_length": len(parsed_text),
+        "text_length": file_data["parsed_text_length"],
         "filename": file_data["filename"],
         "file_type": file_data["file_type"],
-        "preview": parsed_text[:500] if len(parsed_text) > 500 else parsed_text,  # First 500 chars
+        "preview": preview or "",  # First 500 chars
     }
 
 
-@router.get("/parse/{file_id}/text")
+@router.get("/parse/{file_id}/text", response_class=ORJSONResponse)
 async def get_parsed_text(file_id: str):
     """
     Get parsed text from a file.
@@ -114,7 +162,7 @@ async def get_parsed_text(file_id: str):
             detail="File not found or session expired"
         )
     
-    parsed_text = file_data.get("parsed_text")
+    parsed_text = await asyncio.to_thread(file_storage.get_parsed_text, file_id)
     
     if not parsed_text:
         raise HTTPException(
@@ -122,10 +170,12 @@ async def get_parsed_text(file_id: str):
             detail="File has not been parsed yet. Call POST /api/parse/{file_id} first."
         )
     
-    return {
+    # Return the response directly: the text can be large, and this skips
+    # jsonable_encoder's walk before orjson encodes it
+    return ORJSONResponse({
         "file_id": file_id,
         "text": parsed_text,
         "text_length": len(parsed_text),
         "filename": file_data["filename"],
-    }
+    })
 
@@ -1,16 +1,38 @@
 """
 User profile API endpoints.
 """
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
-from sqlalchemy.orm import Session
-from pydantic import BaseModel
-from typing import Optional
-from app.models.database import get_db, UserProfile, UserCV
+import hashlib
+import os
+import re
+from datetime import datetime
+from types import MappingProxyType
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, UploadFile, File, Form
+from sqlalchemy import exists, insert, update
+from sqlalchemy.orm import Session, joinedload
+from pydantic import BaseModel, field_validator
+from typing import Optional, Tuple
+from app.models.database import get_db, User, UserProfile, UserCV
 from app.api.auth import get_current_user
-import base64
+from app.services.auth_service import invalidate_user_cache
+from app.utils.file_validation import SNIFF_BYTES, read_upload_limited, sniff_file_type
+from app.utils.http_cache import etag_matches
 
 router = APIRouter()
 
+# CV file type lookups, built once (read-only)
+_MIME_TO_TYPE = MappingProxyType({
+    "application/pdf": "pdf",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document": "docx",
+    "text/plain": "txt",
+})
+_EXT_TO_TYPE = MappingProxyType({".pdf": "pdf", ".docx": "docx", ".txt": "txt"})
+_TYPE_TO_MIME = MappingProxyType({file_type: mime for mime, file_type in _MIME_TO_TYPE.items()})
+_ALLOWED_MIMES = frozenset(_MIME_TO_TYPE)
+_ALLOWED_EXTENSIONS = frozenset(_EXT_TO_TYPE)
+
+# Profile links must be absolute http(s) URLs; compiled once at import
+_URL_RE = re.compile(r"https?://[^\s/$.?#][^\s]*", re.IGNORECASE)
+
 
 class ProfileUpdateRequest(BaseModel):
     first_name: Optional[str] = None
@@ -21,6 +43,17 @@ class ProfileUpdateRequest(BaseModel):
     linkedin_url: Optional[str] = None
     github_url: Optional[str] = None
     website_url: Optional[str] = None
+    
+    @field_validator("linkedin_url", "github_url", "website_url")
+    @classmethod
+    def validate_url(cls, value: Optional[str]) -> Optional[str]:
+        """Accept blank (cleared) links or absolute http(s) URLs."""
+        if value is None:
+            return None
+        value = value.strip()
+        if value and not _URL_RE.fullmatch(value):
+            raise ValueError("must be a valid http:// or https:// URL")
+        return value
 
 
 class ProfileResponse(BaseModel):
@@ -28,24 +61,54 @@ class ProfileResponse(BaseModel):
     email: str
     first_name: Optional[str]
     last_name: Optional[str]
-    location: Optional[str]
-    education: Optional[str]
-    bio: Optional[str]
-    linkedin_url: Optional[str]
-    github_url: Optional[str]
-    website_url: Optional[str]
+    location: Optional[str] = None
+    education: Optional[str] = None
+    bio: Optional[str] = None
+    linkedin_url: Optional[str] = None
+    github_url: Optional[str] = None
+    website_url: Optional[str] = None
     has_cv: bool
 
 
+# ProfileResponse fields stored on UserProfile
+_PROFILE_FIELDS = ("location", "education", "bio", "linkedin_url", "github_url", "website_url")
+
+
 class CVResponse(BaseModel):
     id: int
     filename: str
     file_type: str
     file_size: int
-    uploaded_at: str
+    uploaded_at: datetime
     is_active: bool
 
 
+def _profile_response(user: User, has_cv: bool) -> ProfileResponse:
+    """Build the profile response for a user loaded by _load_user_with_profile."""
+    data = {
+        "user_id": user.id,
+        "email": user.email,
+        "first_name": user.first_name,
+        "last_name": user.last_name,
+        "has_cv": has_cv,
+    }
+    if user.profile is not None:
+        data.update({field: getattr(user.profile, field) for field in _PROFILE_FIELDS})
+    return ProfileResponse.model_validate(data)
+
+
+def _load_user_with_profile(db: Session, user_id: int) -> Tuple[Optional[User], bool]:
+    """Load a user with their profile and whether they have an active CV, in one query."""
+    # Correlated EXISTS: the CV rows (and file_content) are never materialized
+    has_cv = exists().where(UserCV.user_id == User.id, UserCV.is_active == True)
+    row = db.query(User, has_cv.label("has_cv")).options(
+        joinedload(User.profile),
+    ).filter(User.id == user_id).first()
+    if row is None:
+        return None, False
+    return row.User, bool(row.has_cv)
+
+
 @router.get("/", response_model=ProfileResponse)
 async def get_profile(
     current_user: dict = Depends(get_current_user),
@@ -54,34 +117,12 @@ async def get_profile(
     """Get user profile."""
     user_id = current_user["id"]
     
-    # Get user from database to get email
-    from app.services.auth_service import get_user_by_id
-    user = get_user_by_id(db, user_id)
+    # User, profile and active-CV flag come from a single query
+    user, has_cv = _load_user_with_profile(db, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    # Get or create profile
-    profile = db.query(UserProfile).filter(UserProfile.user_id == user_id).first()
-    
-    # Check if user has CV
-    cv = db.query(UserCV).filter(
-        UserCV.user_id == user_id,
-        UserCV.is_active == True
-    ).first()
-    
-    return ProfileResponse(
-        user_id=user_id,
-        email=user.email,
-        first_name=user.first_name,
-        last_name=user.last_name,
-        location=profile.location if profile else None,
-        education=profile.education if profile else None,
-        bio=profile.bio if profile else None,
-        linkedin_url=profile.linkedin_url if profile else None,
-        github_url=profile.github_url if profile else None,
-        website_url=profile.website_url if profile else None,
-        has_cv=cv is not None
-    )
+    return _profile_response(user, has_cv=has_cv)
 
 
 @router.put("/", response_model=ProfileResponse)
@@ -93,9 +134,8 @@ async def update_profile(
     """Update user profile."""
     user_id = current_user["id"]
     
-    # Get user
-    from app.services.auth_service import get_user_by_id
-    user = get_user_by_id(db, user_id)
+    # Get user, profile and active-CV flag in a single query
+    user, has_cv = _load_user_with_profile(db, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
@@ -106,11 +146,7 @@ async def update_profile(
         raise HTTPException(status_code=400, detail="Last name is required")
     
     # Check if CV is uploaded (mandatory for profile completion)
-    cv = db.query(UserCV).filter(
-        UserCV.user_id == user_id,
-        UserCV.is_active == True
-    ).first()
-    if not cv:
+    if not has_cv:
         raise HTTPException(
             status_code=400,
             detail="CV upload is required to complete your profile"
@@ -126,10 +162,11 @@ async def update_profile(
         user.full_name = f"{user.first_name or ''} {user.last_name or ''}".strip() or None
     
     # Get or create profile
-    profile = db.query(UserProfile).filter(UserProfile.user_id == user_id).first()
+    profile = user.profile
     if not profile:
+        # Attach through the relationship so user.profile is set for the response
         profile = UserProfile(user_id=user_id)
-        db.add(profile)
+        user.profile = profile
     
     # Update profile fields
     if request.location is not None:
@@ -145,29 +182,11 @@ async def update_profile(
     if request.website_url is not None:
         profile.website_url = request.website_url
     
+    # Sessions don't expire on commit, so the loaded objects are already current
     db.commit()
-    db.refresh(profile)
-    db.refresh(user)
+    invalidate_user_cache(user_id)
     
-    # Check if user has CV
-    cv = db.query(UserCV).filter(
-        UserCV.user_id == user_id,
-        UserCV.is_active == True
-    ).first()
-    
-    return ProfileResponse(
-        user_id=user_id,
-        email=user.email,
-        first_name=user.first_name,
-        last_name=user.last_name,
-        location=profile.location,
-        education=profile.education,
-        bio=profile.bio,
-        linkedin_url=profile.linkedin_url,
-        github_url=profile.github_url,
-        website_url=profile.website_url,
-        has_cv=cv is not None
-    )
+    return _profile_response(user, has_cv=has_cv)
 
 
 @router.post("/cv", response_model=CVResponse)
@@ -179,40 +198,30 @@ async def upload_cv(
     """Upload user CV/resume."""
     user_id = current_user["id"]
     
-    # Validate file type - check both MIME type and file extension
-    allowed_types = ["application/pdf", "application/vnd.openxmlformats-officedocument.wordprocessingml.document", "text/plain"]
-    allowed_extensions = [".pdf", ".docx", ".txt"]
+    # Get file extension ("" when the name has none)
+    file_extension = os.path.splitext(file.filename or "")[1].lower()
     
-    # Get file extension
-    filename_lower = file.filename.lower() if file.filename else ""
-    file_extension = "." + filename_lower.split(".")[-1] if "." in filename_lower else ""
-    
-    # Check if file type is allowed (either by MIME type or extension)
-    if file.content_type not in allowed_types and file_extension not in allowed_extensions:
+    # Validate file type - allowed by either MIME type or extension
+    if file.content_type not in _ALLOWED_MIMES and file_extension not in _ALLOWED_EXTENSIONS:
         raise HTTPException(
             status_code=400,
             detail=f"Invalid file type. Only PDF, DOCX, and TXT files are allowed. Got: {file.content_type or 'unknown'}, extension: {file_extension or 'none'}"
         )
     
-    # Read file content
-    content = await file.read()
+    # Read file content in chunks, rejecting oversized files before they are fully buffered
+    hasher = hashlib.sha256()
+    content, error_message = await read_upload_limited(file, hasher=hasher)
+    if content is None:
+        raise HTTPException(status_code=400, detail=error_message)
     file_size = len(content)
+    content_sha256 = hasher.hexdigest()
     
-    # Encode to base64 for storage
-    file_content_b64 = base64.b64encode(content).decode('utf-8')
-    
-    # Determine file type - use extension if MIME type is unknown
-    file_type_map = {
-        "application/pdf": "pdf",
-        "application/vnd.openxmlformats-officedocument.wordprocessingml.document": "docx",
-        "text/plain": "txt"
-    }
-    file_type = file_type_map.get(file.content_type, "unknown")
-    
-    # If MIME type is unknown, try to determine from extension
-    if file_type == "unknown" and file_extension:
-        extension_map = {".pdf": "pdf", ".docx": "docx", ".txt": "txt"}
-        file_type = extension_map.get(file_extension, "unknown")
+    # Determine file type - trust the bytes first, then MIME type, then extension
+    file_type = (
+        sniff_file_type(content[:SNIFF_BYTES])
+        or _MIME_TO_TYPE.get(file.content_type)
+        or _EXT_TO_TYPE.get(file_extension, "unknown")
+    )
     
     # Final check - if still unknown, reject
     if file_type == "unknown":
@@ -221,33 +230,52 @@ async def upload_cv(
             detail=f"Could not determine file type. Please ensure the file is PDF, DOCX, or TXT."
         )
     
-    # Deactivate existing CVs
-    db.query(UserCV).filter(
+    # Deactivate existing CVs and insert the new one in a single transaction.
+    # Core statements skip unit-of-work bookkeeping, and RETURNING replaces refresh().
+    filename = file.filename or "resume"
+    db.execute(
+        update(UserCV)
+        .where(UserCV.user_id == user_id, UserCV.is_active == True)
+        .values(is_active=False)
+    )
+    
+    # Re-uploading a file this user already stored just reactivates that row
+    existing_id = db.query(UserCV.id).filter(
         UserCV.user_id == user_id,
-        UserCV.is_active == True
-    ).update({"is_active": False})
+        UserCV.content_sha256 == content_sha256
+    ).order_by(UserCV.id.desc()).limit(1).scalar()
+    
+    if existing_id is not None:
+        cv_id, uploaded_at = db.execute(
+            update(UserCV)
+            .where(UserCV.id == existing_id)
+            .values(is_active=True, filename=filename, file_type=file_type, uploaded_at=datetime.utcnow())
+            .returning(UserCV.id, UserCV.uploaded_at)
+        ).one()
+    else:
+        cv_id, uploaded_at = db.execute(
+            insert(UserCV)
+            .values(
+                user_id=user_id,
+                filename=filename,
+                file_type=file_type,
+                file_content=content,
+                content_sha256=content_sha256,
+                file_size=file_size,
+                is_active=True
+            )
+            .returning(UserCV.id, UserCV.uploaded_at)
+        ).one()
+    db.commit()
     
-    # Create new CV record
-    cv = UserCV(
-        user_id=user_id,
-        filename=file.filename or "resume",
+    return CVResponse(
+        id=cv_id,
+        filename=filename,
         file_type=file_type,
-        file_content=file_content_b64,
         file_size=file_size,
+        uploaded_at=uploaded_at,
         is_active=True
     )
-    db.add(cv)
-    db.commit()
-    db.refresh(cv)
-    
-    return CVResponse(
-        id=cv.id,
-        filename=cv.filename,
-        file_type=cv.file_type,
-        file_size=cv.file_size,
-        uploaded_at=cv.uploaded_at.isoformat(),
-        is_active=cv.is_active
-    )
 
 
 @router.get("/cv", response_model=CVResponse)
@@ -258,7 +286,11 @@ async def get_cv(
     """Get user's active CV."""
     user_id = current_user["id"]
     
-    cv = db.query(UserCV).filter(
+    # Metadata only; skip the file_content blob
+    cv = db.query(
+        UserCV.id, UserCV.filename, UserCV.file_type, UserCV.file_size,
+        UserCV.uploaded_at, UserCV.is_active
+    ).filter(
         UserCV.user_id == user_id,
         UserCV.is_active == True
     ).first()
@@ -271,22 +303,26 @@ async def get_cv(
         filename=cv.filename,
         file_type=cv.file_type,
         file_size=cv.file_size,
-        uploaded_at=cv.uploaded_at.isoformat(),
+        uploaded_at=cv.uploaded_at,
         is_active=cv.is_active
     )
 
 
 @router.get("/cv/download")
 async def download_cv(
+    request: Request,
     current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Download user's active CV."""
-    from fastapi.responses import Response
+    """
+    Download user's active CV.
     
+    Clients revalidating with If-None-Match get a bare 304 and the file bytes are never loaded.
+    """
     user_id = current_user["id"]
     
-    cv = db.query(UserCV).filter(
+    # Metadata first; the blob is only read when the client's copy is stale
+    cv = db.query(UserCV.id, UserCV.uploaded_at, UserCV.content_sha256, UserCV.file_type, UserCV.filename).filter(
         UserCV.user_id == user_id,
         UserCV.is_active == True
     ).first()
@@ -294,20 +330,24 @@ async def download_cv(
     if not cv:
         raise HTTPException(status_code=404, detail="No CV found")
     
-    # Decode base64 content
-    file_content = base64.b64decode(cv.file_content)
+    # Full-precision upload time plus the content hash, so two uploads in the same second differ
+    digest = hashlib.md5(
+        f"{cv.id}:{cv.uploaded_at.isoformat()}:{cv.content_sha256 or ''}".encode("utf-8"),
+        usedforsecurity=False
+    )
+    etag = f'"{digest.hexdigest()}"'
+    # The URL never changes across uploads, so always revalidate (a 304 is cheap)
+    cache_headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=cache_headers)
+    
+    file_content = db.query(UserCV.file_content).filter(UserCV.id == cv.id).scalar()
     
     # Determine content type
-    content_type_map = {
-        "pdf": "application/pdf",
-        "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-        "txt": "text/plain"
-    }
-    content_type = content_type_map.get(cv.file_type, "application/octet-stream")
+    content_type = _TYPE_TO_MIME.get(cv.file_type, "application/octet-stream")
     
     return Response(
         content=file_content,
         media_type=content_type,
-        headers={"Content-Disposition": f'attachment; filename="{cv.filename}"'}
+        headers={"Content-Disposition": f'attachment; filename="{cv.filename}"', **cache_headers}
     )
-
@@ -2,6 +2,8 @@
 PDF Report Generation API endpoints.
 """
 import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
 from functools import partial
 from typing import Optional
 from fastapi import APIRouter, HTTPException, Query
@@ -11,13 +13,32 @@ from app.models.schemas import SkillGapReport
 from app.services.gap_analysis import gap_analyzer
 from app.services.fit_score import fit_score_calculator
 from app.services.recommendations import recommendations_generator
-from app.services.pdf_generator import pdf_report_generator
 from app.services.unified_extraction import unified_skill_extractor
 from app.utils.file_storage import file_storage
 
 router = APIRouter()
 
 
+# ReportLab's doc.build is pure-Python CPU work that holds the GIL, so
+# reports are rendered in worker processes instead of the default thread pool.
+pdf_pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+
+
+def _render_pdf(report: SkillGapReport) -> bytes:
+    """
+    Top-level entry point for PDF pool workers.
+    
+    Args:
+        report: SkillGapReport to render
+        
+    Returns:
+        PDF file bytes
+    """
+    # Imported here so ReportLab is only loaded by the pool workers
+    from app.services.pdf_generator import pdf_report_generator
+    return pdf_report_generator.generate_pdf(report).getvalue()
+
+
 @router.post("/generate-pdf")
 async def generate_pdf_report(request: AnalyzeGapRequest):
     """
@@ -93,15 +114,15 @@ async def generate_pdf_report(request: AnalyzeGapRequest):
             version="1.0.0"
         )
         
-        # Generate PDF (run in thread pool with timeout to avoid blocking)
+        # Generate PDF (run in process pool with timeout to avoid blocking)
         loop = asyncio.get_running_loop()
         PDF_GENERATION_TIMEOUT = 60  # 1 minute for PDF generation
         
         try:
-            pdf_buffer = await asyncio.wait_for(
+            pdf_bytes = await asyncio.wait_for(
                 loop.run_in_executor(
-                    None,
-                    pdf_report_generator.generate_pdf,
+                    pdf_pool,
+                    _render_pdf,
                     report
                 ),
                 timeout=PDF_GENERATION_TIMEOUT
@@ -113,7 +134,7 @@ async def generate_pdf_report(request: AnalyzeGapRequest):
             )
         
         return Response(
-            content=pdf_buffer.read(),
+            content=pdf_bytes,
             media_type="application/pdf",
             headers={
                 "Content-Disposition": "attachment; filename=skill_gap_report.pdf"
@@ -161,8 +182,12 @@ async def generate_pdf_from_ids(
             raise HTTPException(status_code=404, detail=f"Job description file {jd_id} not found")
         
         # Extract text
-        resume_text = resume_file.get("parsed_text") or resume_file.get("content", "")
-        jd_text = jd_file.get("parsed_text") or jd_file.get("content", "")
+        resume_text, jd_text = await asyncio.gather(
+            asyncio.to_thread(file_storage.get_parsed_text, resume_id),
+            asyncio.to_thread(file_storage.get_parsed_text, jd_id),
+        )
+        resume_text = resume_text or resume_file.get("content", "")
+        jd_text = jd_text or jd_file.get("content", "")
         
         if isinstance(resume_text, bytes):
             resume_text = resume_text.decode("utf-8", errors="ignore")
@@ -1,9 +1,11 @@
 """
 Text input API endpoints for plain text resume and job description input.
 """
+import asyncio
 from fastapi import APIRouter, HTTPException
 from app.models.api_models import TextInputRequest, TextInputResponse
 from app.services.file_parser import text_input_service
+from app.utils.file_storage import file_storage
 
 router = APIRouter()
 
@@ -38,14 +40,14 @@ async def submit_text(request: TextInputRequest):
             detail=error_message
         )
     
-    # Get stored text to return length
-    stored_text, get_error = text_input_service.get_text(text_id)
+    # Stored text length comes from the metadata, without reading the text back
+    file_data = file_storage.get_file(text_id)
     
-    if get_error:
+    if not file_data:
         # This shouldn't happen, but handle it gracefully
         text_length = len(request.text)
     else:
-        text_length = len(stored_text) if stored_text else len(request.text)
+        text_length = file_data["parsed_text_length"] or len(request.text)
     
     return TextInputResponse(
         text_id=text_id,
@@ -65,7 +67,7 @@ async def get_text_input(text_id: str):
     Returns:
         Text content and metadata
     """
-    text, error_message = text_input_service.get_text(text_id)
+    text, error_message = await asyncio.to_thread(text_input_service.get_text, text_id)
     
     if error_message:
         raise HTTPException(
@@ -74,7 +76,6 @@ async def get_text_input(text_id: str):
         )
     
     # Get file metadata
-    from app.utils.file_storage import file_storage
     file_data = file_storage.get_file(text_id)
     
     if not file_data:
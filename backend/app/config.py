@@ -1,11 +1,15 @@
 """
 Application settings and configuration.
 """
+from functools import cached_property, lru_cache
 from pydantic_settings import BaseSettings
 from pydantic import Field
 from typing import List
+import logging
 import os
 
+logger = logging.getLogger(__name__)
+
 
 class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
@@ -18,6 +22,7 @@ class Settings(BaseSettings):
     app_name: str = "SkillSync"
     app_version: str = "1.0.0"
     debug: bool = True
+    log_level: str = "INFO"
     
     # Server Configuration
     host: str = "0.0.0.0"
@@ -43,6 +48,14 @@ class Settings(BaseSettings):
     jwt_secret_key: str = "your-secret-key-change-in-production"  # Change in production!
     jwt_algorithm: str = "HS256"
     jwt_access_token_expire_minutes: int = 60 * 24 * 30  # 30 days (increased from 7 days)
+    jwt_verify_cache_ttl_seconds: float = 30.0  # How long a verified token payload is reused
+    jwt_verify_negative_cache_ttl_seconds: float = 0.0  # How long an invalid token is remembered (0 = never)
+    jwt_verify_cache_max_entries: int = 10_000
+    user_cache_ttl_seconds: int = 30  # How long authenticated user lookups are cached
+    password_hash_time_cost: int = 3  # Argon2id passes; existing hashes are upgraded on login
+    password_hash_memory_kib: int = 65536  # Argon2id memory per hash (64MB)
+    auth_max_failed_attempts: int = 5  # Failed login/verify attempts before returning 429
+    auth_failed_attempt_window_seconds: int = 60
     
     # Google OAuth Settings
     google_client_id: str = ""
@@ -58,14 +71,14 @@ class Settings(BaseSettings):
     smtp_from_name: str = "SkillSync"
     email_verification_code_expiry_minutes: int = 15  # Verification code expires in 15 minutes
     
-    @property
+    @cached_property
     def cors_origins_list(self) -> List[str]:
-        """Parse CORS origins string into list."""
+        """Parse CORS origins string into list (computed once)."""
         return [origin.strip() for origin in self.cors_origins.split(",")]
     
-    @property
+    @cached_property
     def allowed_extensions_list(self) -> List[str]:
-        """Parse allowed extensions string into list."""
+        """Parse allowed extensions string into list (computed once)."""
         return [ext.strip() for ext in self.allowed_extensions.split(",")]
     
     model_config = {
@@ -76,86 +89,82 @@ class Settings(BaseSettings):
     }
 
 
-# Global settings instance
-settings = Settings()
-
-# CRITICAL: Explicitly read OPENAI_API_KEY from environment as fallback
-# Pydantic Settings should handle this automatically, but in some production
-# environments (Railway, Vercel, etc.) it may not work correctly.
-# This ensures the API key is always loaded if it exists in the environment.
-if not settings.openai_api_key or settings.openai_api_key.strip() == "":
-    # Try OPENAI_API_KEY first (most common)
-    if 'OPENAI_API_KEY' in os.environ and os.environ['OPENAI_API_KEY'].strip():
-        settings.openai_api_key = os.environ['OPENAI_API_KEY'].strip()
-        print(f"[CONFIG] ✓ Loaded OPENAI_API_KEY from environment (fallback)")
-    # Try lowercase version
-    elif 'openai_api_key' in os.environ and os.environ['openai_api_key'].strip():
-        settings.openai_api_key = os.environ['openai_api_key'].strip()
-        print(f"[CONFIG] ✓ Loaded openai_api_key from environment (fallback)")
-
-# Always log API key status for production debugging
-api_key_loaded = bool(settings.openai_api_key and settings.openai_api_key.strip() != "")
-api_key_length = len(settings.openai_api_key) if settings.openai_api_key else 0
-env_var_exists = 'OPENAI_API_KEY' in os.environ or 'openai_api_key' in os.environ
-
-print(f"[CONFIG] OpenAI API Key Status:")
-print(f"  - Loaded: {api_key_loaded}")
-print(f"  - Length: {api_key_length}")
-print(f"  - Environment variable exists: {env_var_exists}")
+# Env var names the fallback below had to read directly (reported at startup)
+_fallback_env_vars: List[str] = []
 
-if not api_key_loaded:
-    print(f"[CONFIG] ⚠️  WARNING: OpenAI API Key is NOT loaded!")
-    print(f"[CONFIG]    Please set OPENAI_API_KEY environment variable in your deployment platform.")
-    if env_var_exists:
-        print(f"[CONFIG]    Environment variable exists but is empty or whitespace.")
 
-# CRITICAL: Explicitly read SMTP settings from environment as fallback
-# Similar to OpenAI API key, ensure SMTP settings are loaded in production
-if not settings.smtp_user or settings.smtp_user.strip() == "":
-    if 'SMTP_USER' in os.environ and os.environ['SMTP_USER'].strip():
-        settings.smtp_user = os.environ['SMTP_USER'].strip()
-        print(f"[CONFIG] ✓ Loaded SMTP_USER from environment (fallback)")
-    elif 'smtp_user' in os.environ and os.environ['smtp_user'].strip():
-        settings.smtp_user = os.environ['smtp_user'].strip()
-        print(f"[CONFIG] ✓ Loaded smtp_user from environment (fallback)")
+def _apply_env_fallbacks(settings: Settings) -> None:
+    """Fill secrets pydantic-settings missed straight from os.environ."""
+    # CRITICAL: Explicitly read OPENAI_API_KEY and SMTP settings from environment as fallback
+    # Pydantic Settings should handle this automatically, but in some production
+    # environments (Railway, Vercel, etc.) it may not work correctly.
+    # This ensures the values are always loaded if they exist in the environment.
+    for field in ("openai_api_key", "smtp_user", "smtp_password", "smtp_from_email"):
+        if getattr(settings, field).strip():
+            continue
+        # Try the upper-case name first (most common), then lower-case
+        for env_var in (field.upper(), field):
+            value = os.environ.get(env_var, "").strip()
+            if value:
+                setattr(settings, field, value)
+                _fallback_env_vars.append(env_var)
+                break
 
-if not settings.smtp_password or settings.smtp_password.strip() == "":
-    if 'SMTP_PASSWORD' in os.environ and os.environ['SMTP_PASSWORD'].strip():
-        settings.smtp_password = os.environ['SMTP_PASSWORD'].strip()
-        print(f"[CONFIG] ✓ Loaded SMTP_PASSWORD from environment (fallback)")
-    elif 'smtp_password' in os.environ and os.environ['smtp_password'].strip():
-        settings.smtp_password = os.environ['smtp_password'].strip()
-        print(f"[CONFIG] ✓ Loaded smtp_password from environment (fallback)")
 
-if not settings.smtp_from_email or settings.smtp_from_email.strip() == "":
-    if 'SMTP_FROM_EMAIL' in os.environ and os.environ['SMTP_FROM_EMAIL'].strip():
-        settings.smtp_from_email = os.environ['SMTP_FROM_EMAIL'].strip()
-        print(f"[CONFIG] ✓ Loaded SMTP_FROM_EMAIL from environment (fallback)")
-    elif 'smtp_from_email' in os.environ and os.environ['smtp_from_email'].strip():
-        settings.smtp_from_email = os.environ['smtp_from_email'].strip()
-        print(f"[CONFIG] ✓ Loaded smtp_from_email from environment (fallback)")
+def log_config_status() -> None:
+    """Report which credentials are configured. Called once at app startup."""
+    for env_var in _fallback_env_vars:
+        logger.info("Loaded %s from environment (fallback)", env_var)
+    
+    # Always log API key status for production debugging
+    api_key_loaded = bool(settings.openai_api_key.strip())
+    env_var_exists = 'OPENAI_API_KEY' in os.environ or 'openai_api_key' in os.environ
+    logger.info(
+        "OpenAI API key: loaded=%s length=%d env_var_exists=%s",
+        api_key_loaded, len(settings.openai_api_key), env_var_exists
+    )
+    if not api_key_loaded:
+        logger.warning(
+            "OpenAI API key is NOT loaded. Set the OPENAI_API_KEY environment variable%s.",
+            " (it exists but is empty or whitespace)" if env_var_exists else ""
+        )
+    
+    # Log SMTP configuration status
+    smtp_configured = bool(settings.smtp_user.strip() and settings.smtp_password.strip())
+    logger.info(
+        "SMTP: user=%s password=%s host=%s port=%s from=%s configured=%s",
+        "set" if settings.smtp_user.strip() else "not set",
+        "set" if settings.smtp_password.strip() else "not set",
+        settings.smtp_host,
+        settings.smtp_port,
+        settings.smtp_from_email or "not set",
+        smtp_configured
+    )
+    if not smtp_configured:
+        logger.warning(
+            "SMTP is NOT fully configured; email verification will not work. "
+            "Set SMTP_USER and SMTP_PASSWORD."
+        )
+    
+    # Extra environment details only when debug logging is on
+    if logger.isEnabledFor(logging.DEBUG):
+        env_val = os.environ.get('OPENAI_API_KEY')
+        logger.debug(
+            "Environment: OPENAI_API_KEY exists=%s, openai_api_key exists=%s, OPENAI_API_KEY length=%s, whitespace=%s",
+            env_val is not None,
+            'openai_api_key' in os.environ,
+            len(env_val) if env_val is not None else 0,
+            env_val is not None and env_val.strip() == ''
+        )
 
-# Log SMTP configuration status
-smtp_configured = bool(settings.smtp_user and settings.smtp_password and settings.smtp_user.strip() != "" and settings.smtp_password.strip() != "")
-print(f"[CONFIG] SMTP Configuration Status:")
-print(f"  - SMTP User: {'✓ Set' if settings.smtp_user and settings.smtp_user.strip() else '✗ Not set'}")
-print(f"  - SMTP Password: {'✓ Set' if settings.smtp_password and settings.smtp_password.strip() else '✗ Not set'}")
-print(f"  - SMTP Host: {settings.smtp_host}")
-print(f"  - SMTP Port: {settings.smtp_port}")
-print(f"  - SMTP From Email: {settings.smtp_from_email or 'Not set'}")
-print(f"  - Fully Configured: {smtp_configured}")
 
-if not smtp_configured:
-    print(f"[CONFIG] ⚠️  WARNING: SMTP is NOT fully configured!")
-    print(f"[CONFIG]    Email verification will not work. Please set SMTP_USER and SMTP_PASSWORD in Railway.")
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Build the settings once per process (.env parse + env fallbacks)."""
+    settings = Settings()
+    _apply_env_fallbacks(settings)
+    return settings
 
-# Debug: Print additional details (only in debug mode)
-if settings.debug:
-    print(f"[CONFIG DEBUG] Environment OPENAI_API_KEY exists: {'OPENAI_API_KEY' in os.environ}")
-    print(f"[CONFIG DEBUG] Environment openai_api_key exists: {'openai_api_key' in os.environ}")
-    if 'OPENAI_API_KEY' in os.environ:
-        env_val = os.environ['OPENAI_API_KEY']
-        print(f"[CONFIG DEBUG] OPENAI_API_KEY from env length: {len(env_val)}")
-        print(f"[CONFIG DEBUG] OPENAI_API_KEY preview: {env_val[:10]}...")
-        print(f"[CONFIG DEBUG] OPENAI_API_KEY is whitespace: {env_val.strip() == ''}")
 
+# Global settings instance
+settings = get_settings()
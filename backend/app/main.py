@@ -1,18 +1,51 @@
 """
 Main FastAPI application entry point.
 """
+import asyncio
+import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.exceptions import RequestValidationError
 from app.api import router as api_router
-from app.config import settings
+from app.api.report import pdf_pool
+from app.config import log_config_status, settings
+from app.models.database import DBSessionMiddleware, init_db, warm_pool
+from app.services.email_service import smtp_pool
+from app.services.file_parser import parse_pool
+from app.services.llm_service import llm_service
+from app.utils.file_storage import file_storage
+from app.utils.gzip_middleware import SelectiveGZipMiddleware
+from app.utils.logging_config import configure_logging
+
+configure_logging(settings.log_level)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Report configuration, create database tables and warm the connection pool, off the event loop.
+    
+    On shutdown, idle SMTP connections are closed, the parsed-text directory is removed
+    and the parse/PDF worker process pools are shut down.
+    """
+    log_config_status()
+    await asyncio.to_thread(init_db)
+    await asyncio.to_thread(warm_pool)
+    yield
+    await asyncio.to_thread(smtp_pool.close_all)
+    await asyncio.to_thread(file_storage.close)
+    for pool in (parse_pool, pdf_pool):
+        await asyncio.to_thread(pool.shutdown, wait=False, cancel_futures=True)
+
 
 app = FastAPI(
     title=settings.app_name,
     description="AI-powered application to analyze resume-job skill gaps, education alignment, and provide personalized recommendations",
     version=settings.app_version,
     debug=settings.debug,
+    default_response_class=ORJSONResponse,  # orjson serializes responses in C
+    lifespan=lifespan,
 )
 
 # CORS middleware configuration
@@ -22,8 +55,16 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    max_age=7200,  # Let browsers reuse preflight results for 2h (Chromium's cap) instead of 10min
 )
 
+# Compress JSON/text responses for clients that accept gzip
+# (PDF/DOCX downloads and responses that already set Content-Encoding pass through untouched)
+app.add_middleware(SelectiveGZipMiddleware, minimum_size=500, compresslevel=5)
+
+# Request-scoped database sessions (released after each response)
+app.add_middleware(DBSessionMiddleware)
+
 # Exception handler to ensure error details are returned
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
@@ -53,22 +94,25 @@ async def health_check():
 
 
 # Debug/config endpoint - always available for production troubleshooting
+# Settings and the environment don't change after startup, so the report is built once
+_DEBUG_CONFIG_SNAPSHOT = {
+    "openai_api_key_set": bool(settings.openai_api_key and settings.openai_api_key.strip() != ""),
+    "openai_api_key_length": len(settings.openai_api_key) if settings.openai_api_key else 0,
+    "openai_api_key_preview": settings.openai_api_key[:10] + "..." if settings.openai_api_key and len(settings.openai_api_key) > 10 else "NOT_SET",
+    "llm_model": settings.llm_model,
+    "debug": settings.debug,
+    "env_OPENAI_API_KEY_exists": 'OPENAI_API_KEY' in os.environ,
+    "env_openai_api_key_exists": 'openai_api_key' in os.environ,
+    "env_OPENAI_API_KEY_length": len(os.environ.get('OPENAI_API_KEY', '')) if 'OPENAI_API_KEY' in os.environ else 0
+}
+
+
 @app.get("/debug/config")
 async def debug_config():
     """Debug endpoint to check configuration (available in production for troubleshooting)."""
-    import os
-    from app.services.llm_service import llm_service
-    
     return {
-        "openai_api_key_set": bool(settings.openai_api_key and settings.openai_api_key.strip() != ""),
-        "openai_api_key_length": len(settings.openai_api_key) if settings.openai_api_key else 0,
-        "openai_api_key_preview": settings.openai_api_key[:10] + "..." if settings.openai_api_key and len(settings.openai_api_key) > 10 else "NOT_SET",
-        "llm_model": settings.llm_model,
+        **_DEBUG_CONFIG_SNAPSHOT,
         "llm_service_configured": llm_service.is_configured(),
-        "debug": settings.debug,
-        "env_OPENAI_API_KEY_exists": 'OPENAI_API_KEY' in os.environ,
-        "env_openai_api_key_exists": 'openai_api_key' in os.environ,
-        "env_OPENAI_API_KEY_length": len(os.environ.get('OPENAI_API_KEY', '')) if 'OPENAI_API_KEY' in os.environ else 0
     }
 
 # Additional debug endpoints - only available in debug mode
@@ -1,10 +1,13 @@
 """
 Database models for authentication and user profiles.
 """
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, Boolean, Text
+from sqlalchemy import create_engine, event, Column, Integer, String, DateTime, Boolean, Text, LargeBinary, Index, func, text
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import relationship, sessionmaker, scoped_session, validates
+from contextvars import ContextVar
 from datetime import datetime
+import threading
 import os
 
 # Database URL
@@ -17,12 +20,64 @@ if db_path != DATABASE_URL:  # Only if it's a file path
     if db_dir:
         os.makedirs(db_dir, exist_ok=True)
 
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {}
+# SQLite is a local file: there is no server connection to go stale, so it keeps
+# SQLAlchemy's default pool and skips pre-ping and recycling
+_IS_SQLITE = make_url(DATABASE_URL).get_backend_name() == "sqlite"
+
+# Connection pool sizing for server databases (overridable per deployment)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "40"))
+# Recycle connections before server-side idle timeouts (e.g. Postgres proxies) drop them
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "3600"))
+
+if _IS_SQLITE:
+    engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+else:
+    engine = create_engine(
+        DATABASE_URL,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=True,
+    )
+
+# Per-connection SQLite tuning, applied once when the pool opens a connection:
+# WAL lets readers run alongside a writer, NORMAL sync is safe under WAL, and
+# memory-mapped I/O plus a 64MB page cache keep hot pages out of read() syscalls.
+_SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-64000",
 )
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+if _IS_SQLITE:
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in _SQLITE_PRAGMAS:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+# Identifies the HTTP request that owns the current session; set by DBSessionMiddleware.
+# Context variables are copied into FastAPI's threadpool, so sync dependencies and
+# async handlers of one request share a session while concurrent requests never do.
+_session_scope: ContextVar = ContextVar("db_session_scope", default=None)
+
+
+def _current_session_scope():
+    """Return the scope key for the current session (request, else thread)."""
+    scope = _session_scope.get()
+    return scope if scope is not None else threading.get_ident()
+
+
+SessionLocal = scoped_session(
+    sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine),
+    scopefunc=_current_session_scope,
+)
 Base = declarative_base()
 
 
@@ -30,7 +85,7 @@ class User(Base):
     """User model for authentication."""
     __tablename__ = "users"
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     email = Column(String, unique=True, index=True, nullable=False)
     hashed_password = Column(String, nullable=True)  # Nullable for OAuth users
     first_name = Column(String, nullable=True)
@@ -44,13 +99,32 @@ class User(Base):
     verification_code_expires = Column(DateTime, nullable=True)  # Code expiration time
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    # user_id columns carry no FOREIGN KEY constraint, so the join is spelled out.
+    # Loads lazily; profile endpoints opt in with joinedload.
+    profile = relationship(
+        "UserProfile",
+        primaryjoin="User.id == foreign(UserProfile.user_id)",
+        uselist=False,
+        back_populates="user"
+    )
+    
+    __table_args__ = (
+        # Guarantees case-insensitive uniqueness and serves lower(email) lookups
+        Index("ix_users_email_lower", func.lower(email), unique=True),
+    )
+    
+    @validates("email")
+    def _normalize_email(self, key, value):
+        """Store emails lowercased so equality lookups hit the email index."""
+        return value.lower().strip() if value else value
 
 
 class UserProfile(Base):
     """User profile information."""
     __tablename__ = "user_profiles"
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     user_id = Column(Integer, nullable=False, index=True)
     location = Column(String, nullable=True)
     education = Column(String, nullable=True)  # College/Education
@@ -60,20 +134,41 @@ class UserProfile(Base):
     website_url = Column(String, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    user = relationship(
+        "User",
+        primaryjoin="User.id == foreign(UserProfile.user_id)",
+        back_populates="profile"
+    )
 
 
 class UserCV(Base):
     """User uploaded CV/resume."""
     __tablename__ = "user_cvs"
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     user_id = Column(Integer, nullable=False, index=True)
     filename = Column(String, nullable=False)
     file_type = Column(String, nullable=False)  # pdf, docx, txt
-    file_content = Column(Text, nullable=False)  # Base64 encoded or file path
+    content_sha256 = Column(String(64), nullable=True, index=True)  # Hex digest, for re-upload dedupe
     file_size = Column(Integer, nullable=False)
     uploaded_at = Column(DateTime, default=datetime.utcnow)
     is_active = Column(Boolean, default=True)  # Only one active CV per user
+    # Keep the blob last: SQLite reads a row's columns in order, so any column stored
+    # after a large value means walking its overflow pages on metadata-only queries
+    file_content = Column(LargeBinary, nullable=False)  # Raw file bytes
+    
+    __table_args__ = (
+        # Indexes only the active row per user; serves the active-CV lookups and
+        # enforces at most one active CV per user
+        Index(
+            "ux_user_cvs_active_user",
+            "user_id",
+            unique=True,
+            sqlite_where=text("is_active = 1"),
+            postgresql_where=text("is_active"),
+        ),
+    )
 
 
 def init_db():
@@ -81,11 +176,51 @@ def init_db():
     Base.metadata.create_all(bind=engine)
 
 
+def warm_pool(size: int = 1 if _IS_SQLITE else DB_POOL_SIZE):
+    """
+    Open `size` pooled connections up front so early requests don't pay connect cost.
+    
+    SQLite connections are just local file handles, so only one is opened there
+    (which also applies the per-connection pragmas before the first request).
+    """
+    connections = []
+    try:
+        for _ in range(size):
+            connection = engine.connect()
+            connections.append(connection)
+            connection.execute(text("SELECT 1"))
+    finally:
+        # Closing returns each connection to the pool, still open
+        for connection in connections:
+            connection.close()
+
+
 def get_db():
-    """Get database session."""
+    """Get the database session scoped to the current request."""
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
+        # Inside a request the middleware removes the session once the response is sent
+        if _session_scope.get() is None:
+            SessionLocal.remove()
+
+
+class DBSessionMiddleware:
+    """ASGI middleware that gives each HTTP request its own scoped session."""
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        token = _session_scope.set(object())
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            SessionLocal.remove()
+            _session_scope.reset(token)
 
@@ -0,0 +1,79 @@
+"""
+In-process limiter for failed authentication attempts.
+"""
+import threading
+from typing import Hashable
+from cachetools import TTLCache
+from app.config import settings
+
+
+class FailedAttemptLimiter:
+    """Counts recent failures per key and blocks keys that fail too often."""
+
+    def __init__(
+        self,
+        max_failures: int = 5,
+        window_seconds: float = 60.0,
+        max_keys: int = 100_000
+    ):
+        """
+        Initialize attempt limiter.
+
+        Args:
+            max_failures: Failures allowed inside the window before a key is blocked
+            window_seconds: How long failures are remembered after the last one
+            max_keys: Maximum number of tracked keys
+        """
+        self._failures: TTLCache = TTLCache(maxsize=max_keys, ttl=window_seconds)
+        self._lock = threading.Lock()
+        self.max_failures = max_failures
+        self.window_seconds = window_seconds
+
+    def is_blocked(self, key: Hashable) -> bool:
+        """
+        Check whether a key has used up its failed attempts.
+
+        Args:
+            key: Identifier for the caller, e.g. (client_ip, email)
+
+        Returns:
+            True if the request should be rejected without doing any work
+        """
+        with self._lock:
+            return self._failures.get(key, 0) >= self.max_failures
+
+    def record_failure(self, key: Hashable) -> None:
+        """
+        Count a failed attempt for a key.
+
+        Args:
+            key: Identifier for the caller, e.g. (client_ip, email)
+        """
+        with self._lock:
+            self._failures[key] = self._failures.get(key, 0) + 1
+
+    def reset(self, key: Hashable) -> None:
+        """
+        Forget failures for a key after a successful attempt.
+
+        Args:
+            key: Identifier for the caller, e.g. (client_ip, email)
+        """
+        with self._lock:
+            self._failures.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all tracked keys."""
+        with self._lock:
+            self._failures.clear()
+
+
+# Global limiter instances
+login_limiter = FailedAttemptLimiter(
+    max_failures=settings.auth_max_failed_attempts,
+    window_seconds=settings.auth_failed_attempt_window_seconds
+)
+verify_email_limiter = FailedAttemptLimiter(
+    max_failures=settings.auth_max_failed_attempts,
+    window_seconds=settings.auth_failed_attempt_window_seconds
+)
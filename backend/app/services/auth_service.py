@@ -1,48 +1,89 @@
 """
 Authentication service for user management and JWT tokens.
 """
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
-from jose import JWTError, jwt
+from typing import Any, Callable, Optional
+import asyncio
+import contextvars
+import functools
+import logging
+import threading
+from cachetools import TTLCache
+from jose import JWTError, jwk, jwt
 import bcrypt
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
 from sqlalchemy.orm import Session
 from app.models.database import User
+from app.services.token_cache import token_cache
 import os
 
 # JWT settings - Import from config to ensure consistency
 from app.config import settings
 
+logger = logging.getLogger(__name__)
+
 SECRET_KEY = settings.jwt_secret_key
 ALGORITHM = settings.jwt_algorithm
 ACCESS_TOKEN_EXPIRE_MINUTES = settings.jwt_access_token_expire_minutes
 
+# Key object built once; passing a str makes jose re-parse the key on every call
+_jwt_key = jwk.construct(SECRET_KEY, ALGORITHM)
+
+# Argon2id parameters for new password hashes (~30-60ms per hash at the defaults).
+# Legacy bcrypt hashes, and Argon2 hashes made with other parameters, still verify
+# and are rehashed on the next successful login.
+_password_hasher = PasswordHasher(
+    time_cost=settings.password_hash_time_cost,
+    memory_cost=settings.password_hash_memory_kib,
+    parallelism=1
+)
+
+# argon2-cffi and bcrypt release the GIL, so hashes run in parallel on threads.
+# A dedicated pool caps concurrent hashes at one per core, bounding CPU and Argon2 memory.
+_password_pool = ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix="password-hash")
+
+# Short-lived cache of the user fields needed by authenticated requests
+_user_cache = TTLCache(maxsize=10_000, ttl=settings.user_cache_ttl_seconds)
+_user_cache_lock = threading.Lock()
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against its hash."""
+    """Verify a password against its hash (Argon2id, or legacy bcrypt)."""
     try:
+        if isinstance(hashed_password, bytes):
+            hashed_password = hashed_password.decode('utf-8')
+        if hashed_password.startswith("$argon2"):
+            try:
+                return _password_hasher.verify(hashed_password, plain_password)
+            except (VerificationError, InvalidHashError):
+                return False
         # bcrypt.checkpw expects bytes, so encode both
-        # If hashed_password is already bytes, this will work fine
-        if isinstance(hashed_password, str):
-            hashed_bytes = hashed_password.encode('utf-8')
-        else:
-            hashed_bytes = hashed_password
-        return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_bytes)
+        return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
     except Exception as e:
-        print(f"Password verification error: {e}")
+        logger.warning("Password verification error: %s", e)
         return False
 
 
 def get_password_hash(password: str) -> str:
-    """Hash a password using bcrypt with strong parameters.
-    
-    Uses cost factor of 12 (default is 12, which is good for production).
-    Higher cost factors (13-14) are more secure but slower.
-    """
-    # Cost factor 12 is a good balance between security and performance
-    # For production, consider 13-14 if performance allows
-    salt = bcrypt.gensalt(rounds=12)
-    hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
-    return hashed.decode('utf-8')
+    """Hash a password using Argon2id with the configured cost parameters."""
+    return _password_hasher.hash(password)
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Check whether a stored hash is bcrypt or uses outdated Argon2 parameters."""
+    if not hashed_password.startswith("$argon2"):
+        return True
+    return _password_hasher.check_needs_rehash(hashed_password)
+
+
+async def run_password_task(func: Callable[..., Any], *args: Any) -> Any:
+    """Run a password hashing/verification call on the password pool without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    # Carry context variables (e.g. the request's DB session scope) into the worker
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(_password_pool, functools.partial(context.run, func, *args))
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -54,83 +95,93 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
         # Use minutes directly for more precise expiration
         expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, _jwt_key, algorithm=ALGORITHM)
     return encoded_jwt
 
 
 def verify_token(token: str) -> Optional[dict]:
-    """Verify and decode a JWT token."""
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    """Verify and decode a JWT token.
+    
+    Recently verified tokens are served from token_cache without re-checking the signature.
+    """
+    cache_hit, payload = token_cache.lookup(token)
+    if cache_hit:
         return payload
+    try:
+        payload = jwt.decode(token, _jwt_key, algorithms=[ALGORITHM])
     except JWTError:
-        return None
+        payload = None
+    token_cache.store(token, payload)
+    return payload
 
 
-def create_user(db: Session, email: str, password: str, full_name: Optional[str] = None, email_verified: bool = False) -> User:
-    """Create a new user with email/password."""
+def create_user(
+    db: Session,
+    email: str,
+    password: str,
+    full_name: Optional[str] = None,
+    email_verified: bool = False,
+    already_hashed: bool = False,
+    commit: bool = True
+) -> User:
+    """Create a new user with email/password.
+    
+    Pass already_hashed=True when `password` is a hash computed by the caller.
+    With commit=False the row is only flushed (so it has an id) and the caller commits.
+    """
     # Normalize email to lowercase for case-insensitive lookups
     email_lower = email.lower().strip()
-    hashed_password = get_password_hash(password)
+    hashed_password = password if already_hashed else get_password_hash(password)
     db_user = User(
         email=email_lower,
         hashed_password=hashed_password,
         full_name=full_name,
-        auth_provider="email",
         email_verified=email_verified
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    if commit:
+        # Sessions don't expire on commit and every default is client-side, so no refresh SELECT
+        db.commit()
+    else:
+        db.flush()
     return db_user
 
 
-def set_verification_code(db: Session, user: User, code: str, expires_at: datetime) -> None:
+def set_verification_code(
+    db: Session,
+    user: User,
+    code: str,
+    expires_at: datetime,
+    commit: bool = True
+) -> None:
     """Set verification code for a user."""
     user.verification_code = code
     user.verification_code_expires = expires_at
-    db.commit()
-    db.refresh(user)
+    if commit:
+        db.commit()
 
 
-def verify_user_email(db: Session, user: User) -> None:
+def verify_user_email(db: Session, user: User, commit: bool = True) -> None:
     """Mark user's email as verified."""
     user.email_verified = True
     user.verification_code = None
     user.verification_code_expires = None
-    db.commit()
-    db.refresh(user)
+    if commit:
+        db.commit()
+    invalidate_user_cache(user.id)
 
 
-def verify_user_email(db: Session, user: User) -> None:
-    """Mark user's email as verified."""
-    user.email_verified = True
-    user.verification_code = None
-    user.verification_code_expires = None
-    db.commit()
-    db.refresh(user)
+def verify_password_for(user: User, password: str) -> bool:
+    """Check a password against an already-loaded user (no database access)."""
+    if not user.hashed_password:
+        return False
+    return verify_password(password, user.hashed_password)
 
 
-def authenticate_user(db: Session, email: str, password: str, require_verified: bool = True) -> Optional[User]:
-    """Authenticate a user with email and password."""
-    # Normalize email to lowercase for case-insensitive lookups
-    email_lower = email.lower().strip()
-    user = db.query(User).filter(User.email == email_lower).first()
-    if not user:
-        print(f"Authentication failed: User not found for email: {email_lower}")
-        return None
-    if not user.hashed_password:
-        print(f"Authentication failed: User {email_lower} has no password set (likely created via Google OAuth)")
-        return None
-    password_valid = verify_password(password, user.hashed_password)
-    if not password_valid:
-        print(f"Authentication failed: Password verification failed for user: {email_lower}")
-        return None
-    if require_verified and not user.email_verified:
-        print(f"Authentication failed: Email not verified for user: {email_lower}")
-        return None
-    print(f"Authentication successful for user: {email_lower}")
-    return user
+def upgrade_password_hash(db: Session, user: User, password: str) -> None:
+    """Re-hash a verified password with the current Argon2 parameters."""
+    user.hashed_password = get_password_hash(password)
+    db.commit()
 
 
 def get_user_by_email(db: Session, email: str) -> Optional[User]:
@@ -144,6 +195,37 @@ def get_user_by_id(db: Session, user_id: int) -> Optional[User]:
     return db.query(User).filter(User.id == user_id).first()
 
 
+def get_user_projection(db: Session, user_id: int) -> Optional[dict]:
+    """Get the fields of a user needed for authentication, cached briefly by ID."""
+    with _user_cache_lock:
+        cached = _user_cache.get(user_id)
+    if cached is not None:
+        return dict(cached)
+    
+    # Column query returns a plain row and skips ORM identity-map bookkeeping
+    row = db.query(
+        User.id, User.email, User.full_name, User.auth_provider, User.updated_at
+    ).filter(User.id == user_id).first()
+    if row is None:
+        return None
+    user = {
+        "id": row.id,
+        "email": row.email,
+        "full_name": row.full_name,
+        "auth_provider": row.auth_provider,
+        "updated_at": row.updated_at,
+    }
+    with _user_cache_lock:
+        _user_cache[user_id] = user
+    return dict(user)
+
+
+def invalidate_user_cache(user_id: int) -> None:
+    """Drop a cached user projection after the user's record changes."""
+    with _user_cache_lock:
+        _user_cache.pop(user_id, None)
+
+
 def get_user_by_google_id(db: Session, google_id: str) -> Optional[User]:
     """Get user by Google ID."""
     return db.query(User).filter(User.google_id == google_id).first()
@@ -167,7 +249,7 @@ def create_or_get_google_user(db: Session, google_id: str, email: str, full_name
         if not existing_user.full_name and full_name:
             existing_user.full_name = full_name
         db.commit()
-        db.refresh(existing_user)
+        invalidate_user_cache(existing_user.id)
         return existing_user
     
     # Create new user
@@ -179,6 +261,5 @@ def create_or_get_google_user(db: Session, google_id: str, email: str, full_name
     )
     db.add(db_user)
     db.commit()
-    db.refresh(db_user)
     return db_user
 
@@ -1,62 +1,33 @@
 """
 Email service for sending verification codes and notifications.
 """
+import logging
+import queue
 import smtplib
+import time
+from email.message import Message
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from typing import Optional
+from typing import Callable, Optional
 import secrets
 from datetime import datetime, timedelta
+from string import Template
 from app.config import settings
 
+logger = logging.getLogger(__name__)
 
-def generate_verification_code() -> str:
-    """Generate a 6-digit verification code."""
-    return ''.join([str(secrets.randbelow(10)) for _ in range(6)])
-
-
-def send_verification_email(email: str, code: str) -> bool:
-    """
-    Send verification code email to user.
-    
-    Args:
-        email: Recipient email address
-        code: Verification code to send
-        
-    Returns:
-        True if email sent successfully, False otherwise
-    """
-    try:
-        # Check if email settings are configured
-        if not settings.smtp_user or not settings.smtp_password:
-            print(f"[EMAIL] ⚠️  Email settings not configured!")
-            print(f"[EMAIL]    SMTP_USER: {'Set' if settings.smtp_user else 'NOT SET'}")
-            print(f"[EMAIL]    SMTP_PASSWORD: {'Set' if settings.smtp_password else 'NOT SET'}")
-            print(f"[EMAIL]    SMTP_HOST: {settings.smtp_host}")
-            print(f"[EMAIL]    SMTP_PORT: {settings.smtp_port}")
-            # In development, print the code instead
-            if settings.debug:
-                print(f"[DEV] Verification code for {email}: {code}")
-            return True  # Return True in dev mode to allow testing
-        
-        # Create message
-        msg = MIMEMultipart('alternative')
-        msg['Subject'] = "Verify Your SkillSync Account"
-        msg['From'] = f"{settings.smtp_from_name} <{settings.smtp_from_email or settings.smtp_user}>"
-        msg['To'] = email
-        
-        # Create email content
-        html_content = f"""
+# Verification email bodies, parsed once; send_verification_email fills in $code and $expiry
+_HTML_TEMPLATE = Template("""
         <!DOCTYPE html>
         <html>
         <head>
             <style>
-                body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
-                .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-                .header {{ background: linear-gradient(to right, #0077b5, #00a0dc); color: white; padding: 20px; text-align: center; border-radius: 5px 5px 0 0; }}
-                .content {{ background: #f9f9f9; padding: 30px; border-radius: 0 0 5px 5px; }}
-                .code {{ background: #fff; border: 2px dashed #0077b5; padding: 20px; text-align: center; font-size: 32px; font-weight: bold; letter-spacing: 5px; margin: 20px 0; color: #0077b5; }}
-                .footer {{ text-align: center; margin-top: 20px; color: #666; font-size: 12px; }}
+                body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
+                .container { max-width: 600px; margin: 0 auto; padding: 20px; }
+                .header { background: linear-gradient(to right, #0077b5, #00a0dc); color: white; padding: 20px; text-align: center; border-radius: 5px 5px 0 0; }
+                .content { background: #f9f9f9; padding: 30px; border-radius: 0 0 5px 5px; }
+                .code { background: #fff; border: 2px dashed #0077b5; padding: 20px; text-align: center; font-size: 32px; font-weight: bold; letter-spacing: 5px; margin: 20px 0; color: #0077b5; }
+                .footer { text-align: center; margin-top: 20px; color: #666; font-size: 12px; }
             </style>
         </head>
         <body>
@@ -67,8 +38,8 @@ def send_verification_email(email: str, code: str) -> bool:
                 <div class="content">
                     <h2>Verify Your Email Address</h2>
                     <p>Thank you for signing up for SkillSync! Please use the verification code below to complete your registration:</p>
-                    <div class="code">{code}</div>
-                    <p>This code will expire in {settings.email_verification_code_expiry_minutes} minutes.</p>
+                    <div class="code">$code</div>
+                    <p>This code will expire in $expiry minutes.</p>
                     <p>If you didn't create an account with SkillSync, please ignore this email.</p>
                 </div>
                 <div class="footer">
@@ -77,19 +48,169 @@ def send_verification_email(email: str, code: str) -> bool:
             </div>
         </body>
         </html>
-        """
-        
-        text_content = f"""
+        """)
+
+_TEXT_TEMPLATE = Template("""
         SkillSync - Verify Your Email Address
         
         Thank you for signing up for SkillSync!
         
-        Your verification code is: {code}
+        Your verification code is: $code
         
-        This code will expire in {settings.email_verification_code_expiry_minutes} minutes.
+        This code will expire in $expiry minutes.
         
         If you didn't create an account with SkillSync, please ignore this email.
+        """)
+
+
+class SMTPConnectionPool:
+    """Keeps authenticated SMTP connections open so sends skip the TLS handshake and AUTH."""
+    
+    def __init__(
+        self,
+        connect: Callable[[], smtplib.SMTP],
+        max_idle: int = 4,
+        idle_timeout_seconds: float = 60.0
+    ):
+        """
+        Initialize SMTP connection pool.
+        
+        Args:
+            connect: Opens a new authenticated connection
+            max_idle: Maximum number of idle connections kept open
+            idle_timeout_seconds: Idle connections older than this are closed instead of reused
+                (servers drop idle clients; Gmail after a few minutes)
+        """
+        self._connect = connect
+        self._idle: queue.LifoQueue = queue.LifoQueue(maxsize=max_idle)
+        self.idle_timeout_seconds = idle_timeout_seconds
+    
+    def _acquire(self) -> smtplib.SMTP:
+        """Take the most recently used live connection, or open a new one."""
+        while True:
+            try:
+                server, last_used = self._idle.get_nowait()
+            except queue.Empty:
+                return self._connect()
+            if time.monotonic() - last_used < self.idle_timeout_seconds:
+                return server
+            self._close(server)
+    
+    def _release(self, server: smtplib.SMTP) -> None:
+        """Return a healthy connection to the pool (or close it if the pool is full)."""
+        try:
+            self._idle.put_nowait((server, time.monotonic()))
+        except queue.Full:
+            self._close(server)
+    
+    @staticmethod
+    def _close(server: smtplib.SMTP) -> None:
+        """Close a connection, ignoring errors from already-dead sockets."""
+        try:
+            server.quit()
+        except Exception:
+            server.close()
+    
+    def send_message(self, msg: Message) -> None:
         """
+        Send a message over a pooled connection.
+        
+        A connection the server has already dropped is replaced and the send retried once.
+        
+        Raises:
+            smtplib.SMTPException: If connecting, authenticating or sending fails
+        """
+        server = self._acquire()
+        try:
+            server.send_message(msg)
+        except smtplib.SMTPServerDisconnected:
+            self._close(server)
+            server = self._connect()
+            try:
+                server.send_message(msg)
+            except Exception:
+                self._close(server)
+                raise
+        except Exception:
+            self._close(server)
+            raise
+        self._release(server)
+    
+    def close_all(self) -> None:
+        """Close every idle connection (called at shutdown)."""
+        while True:
+            try:
+                server, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._close(server)
+
+
+def _connect_smtp() -> smtplib.SMTP:
+    """Open an SMTP connection, upgrade it to TLS and log in."""
+    server = smtplib.SMTP(settings.smtp_host, settings.smtp_port, timeout=30)
+    try:
+        server.starttls()
+        server.login(settings.smtp_user, settings.smtp_password)
+    except Exception:
+        server.close()
+        raise
+    return server
+
+
+# Global SMTP connection pool
+smtp_pool = SMTPConnectionPool(_connect_smtp)
+
+
+def generate_verification_code() -> str:
+    """Generate a 6-digit verification code."""
+    return f"{secrets.randbelow(1_000_000):06d}"
+
+
+def _log_dev_code(email: str, code: str) -> None:
+    """In debug mode, log the verification code so signup works without email delivery."""
+    if settings.debug:
+        logger.info("[DEV] Verification code for %s: %s", email, code)
+
+
+def send_verification_email(email: str, code: str) -> bool:
+    """
+    Send verification code email to user.
+    
+    Args:
+        email: Recipient email address
+        code: Verification code to send
+        
+    Returns:
+        True if email sent successfully, False otherwise
+    """
+    try:
+        # Check if email settings are configured
+        if not settings.smtp_user or not settings.smtp_password:
+            logger.warning(
+                "Email settings not configured (SMTP_USER=%s, SMTP_PASSWORD=%s, host=%s:%s)",
+                "set" if settings.smtp_user else "NOT SET",
+                "set" if settings.smtp_password else "NOT SET",
+                settings.smtp_host,
+                settings.smtp_port
+            )
+            # In development, log the code instead
+            _log_dev_code(email, code)
+            return True  # Return True in dev mode to allow testing
+        
+        # Create message
+        msg = MIMEMultipart('alternative')
+        msg['Subject'] = "Verify Your SkillSync Account"
+        msg['From'] = f"{settings.smtp_from_name} <{settings.smtp_from_email or settings.smtp_user}>"
+        msg['To'] = email
+        
+        # Create email content
+        template_values = {
+            "code": code,
+            "expiry": settings.email_verification_code_expiry_minutes,
+        }
+        html_content = _HTML_TEMPLATE.substitute(template_values)
+        text_content = _TEXT_TEMPLATE.substitute(template_values)
         
         # Attach parts
         part1 = MIMEText(text_content, 'plain')
@@ -99,42 +220,37 @@ def send_verification_email(email: str, code: str) -> bool:
         msg.attach(part2)
         
         # Send email
-        print(f"[EMAIL] Attempting to send verification email to {email}...")
-        print(f"[EMAIL] Using SMTP: {settings.smtp_host}:{settings.smtp_port}")
-        print(f"[EMAIL] From: {settings.smtp_from_email or settings.smtp_user}")
-        
-        with smtplib.SMTP(settings.smtp_host, settings.smtp_port, timeout=30) as server:
-            print(f"[EMAIL] Connected to SMTP server")
-            server.starttls()
-            print(f"[EMAIL] TLS started")
-            server.login(settings.smtp_user, settings.smtp_password)
-            print(f"[EMAIL] Logged in successfully")
-            server.send_message(msg)
-            print(f"[EMAIL] Message sent successfully")
+        logger.debug(
+            "Sending verification email to %s via %s:%s from %s",
+            email, settings.smtp_host, settings.smtp_port, settings.smtp_from_email or settings.smtp_user
+        )
+        
+        # Reuses an authenticated connection when one is idle
+        smtp_pool.send_message(msg)
         
-        print(f"[EMAIL] ✓ Verification email sent to {email}")
+        logger.info("Verification email sent to %s", email)
         return True
         
     except smtplib.SMTPAuthenticationError as e:
-        print(f"[EMAIL] ✗ SMTP Authentication Error: {str(e)}")
-        print(f"[EMAIL]    Check that SMTP_USER and SMTP_PASSWORD are correct")
-        print(f"[EMAIL]    For Gmail, ensure you're using an App Password, not your regular password")
-        if settings.debug:
-            print(f"[DEV] Verification code for {email}: {code}")
+        logger.error(
+            "SMTP authentication error: %s. Check SMTP_USER and SMTP_PASSWORD "
+            "(for Gmail, use an App Password, not your regular password)",
+            e
+        )
+        _log_dev_code(email, code)
         return False
     except smtplib.SMTPException as e:
-        print(f"[EMAIL] ✗ SMTP Error: {str(e)}")
-        if settings.debug:
-            print(f"[DEV] Verification code for {email}: {code}")
+        logger.error("SMTP error: %s", e)
+        _log_dev_code(email, code)
         return False
     except Exception as e:
-        print(f"[EMAIL] ✗ Error sending verification email to {email}: {str(e)}")
-        print(f"[EMAIL]    Error type: {type(e).__name__}")
-        import traceback
-        print(f"[EMAIL]    Traceback: {traceback.format_exc()}")
-        # In development, still print the code
-        if settings.debug:
-            print(f"[DEV] Verification code for {email}: {code}")
+        # Traceback only when debug logging is on
+        logger.error(
+            "Error sending verification email to %s: %s: %s",
+            email, type(e).__name__, e,
+            exc_info=logger.isEnabledFor(logging.DEBUG)
+        )
+        _log_dev_code(email, code)
         return False
 
 
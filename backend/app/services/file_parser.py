@@ -1,28 +1,98 @@
 """
 Unified file parsing service that handles PDF, DOCX, and plain text files.
 """
+import hashlib
 import io
-from typing import Tuple, Optional
+import os
+import threading
+import zipfile
+import xml.etree.ElementTree as ET
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+from typing import Iterable, Iterator, List, Tuple, Optional
+from cachetools import TTLCache
 from docx import Document
 import docx2txt
 import pdfplumber
+import pypdfium2 as pdfium
 from app.utils.file_storage import file_storage
 from app.utils.file_validation import generate_file_id
-from app.utils.text_cleaning import clean_text, normalize_whitespace, remove_encoding_issues
+from app.utils.text_cleaning import clean_extracted_text, clean_text
 
 
 # ============================================================================
 # PDF Parser
 # ============================================================================
 
+# PDFium is not thread-safe; serialize calls within a process
+_pdfium_lock = threading.Lock()
+
+
 class PDFParser:
-    """PDF parsing service using pdfplumber."""
+    """PDF parsing service using PDFium for plain text and pdfplumber for layout."""
+    
+    @staticmethod
+    def _pages_to_process(total_pages: int, max_pages: Optional[int]) -> int:
+        """Number of leading pages to extract."""
+        # Limit pages for very large PDFs to improve performance
+        # Process first 50 pages by default, or all pages if less than 50
+        if max_pages:
+            return min(total_pages, max_pages)
+        return min(total_pages, 50)
+    
+    @staticmethod
+    def _extract_pages_pdfium(pdf_content: bytes, max_pages: Optional[int]) -> List[str]:
+        """Extract per-page text with PDFium (C library, no per-character Python objects)."""
+        page_texts = []
+        with _pdfium_lock:
+            pdf = pdfium.PdfDocument(pdf_content)
+            try:
+                for page_index in range(PDFParser._pages_to_process(len(pdf), max_pages)):
+                    try:
+                        page = pdf[page_index]
+                        try:
+                            textpage = page.get_textpage()
+                            try:
+                                page_text = textpage.get_text_range()
+                            finally:
+                                textpage.close()
+                        finally:
+                            page.close()
+                    except pdfium.PdfiumError:
+                        # Skip unreadable pages, as the pdfplumber path does
+                        continue
+                    # PDFium ends lines with CRLF
+                    page_text = page_text.replace("\r\n", "\n")
+                    if page_text and not page_text.isspace():
+                        page_texts.append(page_text)
+            finally:
+                pdf.close()
+        return page_texts
+    
+    @staticmethod
+    def _extract_pages_pdfplumber(pdf_content: bytes, max_pages: Optional[int]) -> List[str]:
+        """Extract per-page text with pdfplumber (slower; used when PDFium finds nothing)."""
+        page_texts = []
+        with pdfplumber.open(io.BytesIO(pdf_content)) as pdf:
+            for page in pdf.pages[:PDFParser._pages_to_process(len(pdf.pages), max_pages)]:
+                try:
+                    page_text = page.extract_text()
+                except Exception:
+                    # Skip pages that fail and continue with the rest
+                    continue
+                if page_text:
+                    page_texts.append(page_text)
+        return page_texts
     
     @staticmethod
     def extract_text(pdf_content: bytes, max_pages: Optional[int] = None) -> Tuple[str, Optional[str]]:
         """
         Extract text from PDF content.
         
+        PDFium extracts the text layer 10-50x faster than pdfplumber; pdfplumber is
+        only tried when PDFium can't open the file or finds no text.
+        
         Args:
             pdf_content: PDF file content as bytes
             max_pages: Maximum number of pages to process (None for all pages)
@@ -31,47 +101,21 @@ class PDFParser:
             Tuple of (extracted_text, error_message)
         """
         try:
-            # Create file-like object from bytes
-            pdf_file = io.BytesIO(pdf_content)
-            
-            # Extract text from pages
-            full_text = []
-            
-            with pdfplumber.open(pdf_file) as pdf:
-                total_pages = len(pdf.pages)
-                pages_to_process = min(total_pages, max_pages) if max_pages else total_pages
-                
-                # Limit pages for very large PDFs to improve performance
-                # Process first 50 pages by default, or all pages if less than 50
-                if not max_pages and total_pages > 50:
-                    pages_to_process = 50
-                
-                # Iterate through pages
-                for page_num in range(1, pages_to_process + 1):
-                    try:
-                        page = pdf.pages[page_num - 1]
-                        # Extract text from page
-                        page_text = page.extract_text()
-                        
-                        if page_text:
-                            full_text.append(page_text)
-                        
-                    except Exception as e:
-                        # Log error but continue with other pages
-                        error_msg = f"Error extracting text from page {page_num}: {str(e)}"
-                        # Continue with other pages
-                        continue
+            try:
+                full_text = PDFParser._extract_pages_pdfium(pdf_content, max_pages)
+            except pdfium.PdfiumError:
+                full_text = []
+            if not full_text:
+                full_text = PDFParser._extract_pages_pdfplumber(pdf_content, max_pages)
             
             # Combine all pages
             combined_text = "\n\n".join(full_text)
             
-            if not combined_text or combined_text.strip() == "":
+            if not combined_text or combined_text.isspace():
                 return "", "No text could be extracted from the PDF"
             
             # Clean and normalize text
-            cleaned_text = remove_encoding_issues(combined_text)
-            cleaned_text = normalize_whitespace(cleaned_text)
-            cleaned_text = clean_text(cleaned_text)
+            cleaned_text = clean_extracted_text(combined_text)
             
             return cleaned_text, None
             
@@ -109,13 +153,13 @@ class PDFParser:
                         # This handles multi-column layouts better
                         page_text = page.extract_text(layout=True)
                         
-                        if page_text and page_text.strip():
+                        if page_text and not page_text.isspace():
                             full_text.append(page_text)
                             metadata["pages_with_text"] += 1
                         else:
                             # Fallback to regular extraction
                             page_text = page.extract_text()
-                            if page_text and page_text.strip():
+                            if page_text and not page_text.isspace():
                                 full_text.append(page_text)
                                 metadata["pages_with_text"] += 1
                             else:
@@ -127,13 +171,11 @@ class PDFParser:
             
             combined_text = "\n\n".join(full_text)
             
-            if not combined_text or combined_text.strip() == "":
+            if not combined_text or combined_text.isspace():
                 return "", "No text could be extracted from the PDF", metadata
             
             # Clean text
-            cleaned_text = remove_encoding_issues(combined_text)
-            cleaned_text = normalize_whitespace(cleaned_text)
-            cleaned_text = clean_text(cleaned_text)
+            cleaned_text = clean_extracted_text(combined_text)
             
             return cleaned_text, None, metadata
             
@@ -175,6 +217,179 @@ class PDFParser:
 # DOCX Parser
 # ============================================================================
 
+# WordprocessingML tags used by the streaming DOCX text extractor
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_W_BODY, _W_P, _W_R, _W_HYPERLINK = _W + "body", _W + "p", _W + "r", _W + "hyperlink"
+_W_TBL, _W_TBL_GRID, _W_GRID_COL = _W + "tbl", _W + "tblGrid", _W + "gridCol"
+_W_TR, _W_TC, _W_TC_PR, _W_GRID_SPAN, _W_V_MERGE = _W + "tr", _W + "tc", _W + "tcPr", _W + "gridSpan", _W + "vMerge"
+_W_T, _W_BR, _W_TYPE, _W_VAL = _W + "t", _W + "br", _W + "type", _W + "val"
+# Text equivalents of run content, as python-docx renders them
+_W_RUN_TEXT = {_W + "tab": "\t", _W + "ptab": "\t", _W + "cr": "\n", _W + "noBreakHyphen": "-"}
+
+
+def _run_text(run: ET.Element) -> str:
+    """Text of a w:r element."""
+    parts = []
+    for child in run:
+        tag = child.tag
+        if tag == _W_T:
+            parts.append(child.text or "")
+        elif tag == _W_BR:
+            # Only text-wrapping breaks are line breaks; page/column breaks render as ""
+            if child.get(_W_TYPE, "textWrapping") == "textWrapping":
+                parts.append("\n")
+        else:
+            parts.append(_W_RUN_TEXT.get(tag, ""))
+    return "".join(parts)
+
+
+def _paragraph_text(paragraph: ET.Element) -> str:
+    """Text of a w:p element (its runs, including runs inside hyperlinks)."""
+    parts = []
+    for child in paragraph:
+        tag = child.tag
+        if tag == _W_R:
+            parts.append(_run_text(child))
+        elif tag == _W_HYPERLINK:
+            parts.extend(_run_text(run) for run in child if run.tag == _W_R)
+    return "".join(parts)
+
+
+def _table_rows(table: ET.Element) -> List[str]:
+    """
+    Render a top-level w:tbl as " | "-joined rows of non-empty cell text.
+    
+    Mirrors python-docx's layout grid: a cell spanning columns, or continuing a
+    vertical merge, repeats the text of the cell it extends.
+    """
+    grid = table.find(_W_TBL_GRID)
+    column_count = len(grid.findall(_W_GRID_COL)) if grid is not None else 0
+    rows = table.findall(_W_TR)
+    
+    cells: List[str] = []
+    for row in rows:
+        for cell in row.findall(_W_TC):
+            properties = cell.find(_W_TC_PR)
+            grid_span, v_merge = 1, None
+            if properties is not None:
+                span = properties.find(_W_GRID_SPAN)
+                if span is not None:
+                    grid_span = int(span.get(_W_VAL, "1"))
+                merge = properties.find(_W_V_MERGE)
+                if merge is not None:
+                    v_merge = merge.get(_W_VAL, "continue")
+            text = "\n".join(_paragraph_text(p) for p in cell if p.tag == _W_P).strip()
+            for span_index in range(grid_span):
+                if v_merge == "continue":
+                    cells.append(cells[-column_count])
+                elif span_index > 0:
+                    cells.append(cells[-1])
+                else:
+                    cells.append(text)
+    
+    table_rows = []
+    for row_index in range(len(rows)):
+        row_cells = cells[row_index * column_count:(row_index + 1) * column_count]
+        row_text = [text for text in row_cells if text]
+        if row_text:
+            table_rows.append(" | ".join(row_text))
+    return table_rows
+
+
+def _stream_docx_text(docx_content: bytes) -> Tuple[List[str], List[str], int]:
+    """
+    Pull body paragraph text and table rows out of word/document.xml incrementally.
+    
+    Same text as python-docx's doc.paragraphs / doc.tables, but only one top-level
+    block is held in memory at a time, and no other part of the package is read.
+    
+    Returns:
+        Tuple of (paragraph texts, rendered table rows, number of tables)
+        
+    Raises:
+        Exception: If the file isn't a readable DOCX (bad zip, missing part, bad XML)
+    """
+    paragraphs: List[str] = []
+    table_rows: List[str] = []
+    table_count = 0
+    body: Optional[ET.Element] = None
+    depth = 0  # 1 = w:document, 2 = w:body, 3 = top-level blocks
+    with zipfile.ZipFile(io.BytesIO(docx_content)) as archive:
+        with archive.open("word/document.xml") as stream:
+            for event, element in ET.iterparse(stream, events=("start", "end")):
+                if event == "start":
+                    depth += 1
+                    if depth == 2:
+                        body = element if element.tag == _W_BODY else None
+                    continue
+                depth -= 1
+                if depth != 2 or body is None:
+                    continue
+                # Top-level block finished: render it, then drop it from the tree
+                tag = element.tag
+                if tag == _W_P:
+                    paragraphs.append(_paragraph_text(element))
+                elif tag == _W_TBL:
+                    table_rows.extend(_table_rows(element))
+                    table_count += 1
+                body.remove(element)
+    return paragraphs, table_rows, table_count
+
+
+# Recently parsed DOCX documents, keyed by a digest of their bytes. Documents are
+# only read, so the extract/structure/metadata calls for one upload share a parse.
+_DOCX_CACHE_SIZE = 8
+_docx_cache: "OrderedDict[bytes, Document]" = OrderedDict()
+_docx_cache_lock = threading.Lock()
+
+
+def _get_document(docx_content: bytes) -> Document:
+    """Parse DOCX bytes, reusing the Document from a recent call with the same content."""
+    key = hashlib.blake2b(docx_content, digest_size=16).digest()
+    with _docx_cache_lock:
+        doc = _docx_cache.get(key)
+        if doc is not None:
+            _docx_cache.move_to_end(key)
+            return doc
+    
+    doc = Document(io.BytesIO(docx_content))
+    with _docx_cache_lock:
+        _docx_cache[key] = doc
+        while len(_docx_cache) > _DOCX_CACHE_SIZE:
+            _docx_cache.popitem(last=False)
+    return doc
+
+
+def _iter_nonempty(texts: Iterable[str]) -> Iterator[str]:
+    """Yield each text stripped, skipping blank ones (each string is stripped once)."""
+    for text in texts:
+        text = text.strip()
+        if text:
+            yield text
+
+
+def _iter_table_rows(tables) -> Iterator[str]:
+    """
+    Yield python-docx table rows as " | "-joined non-empty cell text.
+    
+    Rows are read straight off each table's w:tbl element by _table_rows (lxml
+    elements share the ElementTree API); row.cells rebuilds the table's layout
+    grid for every row, so it is only used for tables _table_rows can't handle.
+    """
+    for table in tables:
+        try:
+            table_rows = _table_rows(table._tbl)
+        except Exception:
+            table_rows = None
+        if table_rows is not None:
+            yield from table_rows
+            continue
+        for row in table.rows:
+            row_text = " | ".join(_iter_nonempty(cell.text for cell in row.cells))
+            if row_text:
+                yield row_text
+
+
 class DOCXParser:
     """DOCX parsing service using python-docx and docx2txt."""
     
@@ -190,47 +405,40 @@ class DOCXParser:
             Tuple of (extracted_text, error_message)
         """
         try:
-            # Create file-like object from bytes
-            docx_file = io.BytesIO(docx_content)
-            
-            # Try using python-docx first (better structure preservation)
+            # Stream word/document.xml first; python-docx builds the whole object model
             try:
-                doc = Document(docx_file)
-                full_text = []
+                paragraphs, table_rows, _ = _stream_docx_text(docx_content)
+                combined_text = "\n\n".join(chain(_iter_nonempty(paragraphs), table_rows))
                 
-                # Extract text from all paragraphs
-                for paragraph in doc.paragraphs:
-                    if paragraph.text.strip():
-                        full_text.append(paragraph.text.strip())
-                
-                # Extract text from tables
-                for table in doc.tables:
-                    for row in table.rows:
-                        row_text = []
-                        for cell in row.cells:
-                            if cell.text.strip():
-                                row_text.append(cell.text.strip())
-                        if row_text:
-                            full_text.append(" | ".join(row_text))
-                
-                combined_text = "\n\n".join(full_text)
+            except Exception:
+                # Unreadable or unusual file: fall back to python-docx, then docx2txt
+                combined_text = None
+            
+            try:
+                if combined_text is None:
+                    doc = _get_document(docx_content)
+                    
+                    # Text from all paragraphs, then from tables
+                    combined_text = "\n\n".join(chain(
+                        _iter_nonempty(paragraph.text for paragraph in doc.paragraphs),
+                        _iter_table_rows(doc.tables)
+                    ))
                 
             except Exception as e:
                 # Fallback to docx2txt if python-docx fails
                 try:
-                    docx_file.seek(0)  # Reset file pointer
-                    combined_text = docx2txt.process(docx_file)
+                    # Fresh file-like object, only built when this fallback runs
+                    combined_text = docx2txt.process(io.BytesIO(docx_content))
                 except Exception as e2:
                     error_message = f"Error parsing DOCX with both methods: python-docx ({str(e)}), docx2txt ({str(e2)})"
                     return "", error_message
             
-            if not combined_text or combined_text.strip() == "":
+            # Nothing to clean (isspace() avoids building a stripped copy)
+            if not combined_text or combined_text.isspace():
                 return "", "No text could be extracted from the DOCX file"
             
             # Clean and normalize text
-            cleaned_text = remove_encoding_issues(combined_text)
-            cleaned_text = normalize_whitespace(cleaned_text)
-            cleaned_text = clean_text(cleaned_text)
+            cleaned_text = clean_extracted_text(combined_text)
             
             return cleaned_text, None
             
@@ -250,7 +458,6 @@ class DOCXParser:
             Tuple of (extracted_text, error_message, metadata)
         """
         try:
-            docx_file = io.BytesIO(docx_content)
             metadata = {
                 "total_paragraphs": 0,
                 "total_tables": 0,
@@ -258,52 +465,52 @@ class DOCXParser:
                 "extraction_method": "python-docx"
             }
             
+            # Stream word/document.xml first; the counts come from the same pass
             try:
-                doc = Document(docx_file)
-                
-                full_text = []
-                paragraphs = []
-                
-                # Extract paragraphs
-                for paragraph in doc.paragraphs:
-                    metadata["total_paragraphs"] += 1
-                    if paragraph.text.strip():
-                        paragraphs.append(paragraph.text.strip())
-                        metadata["paragraphs_with_text"] += 1
+                all_paragraphs, table_rows, table_count = _stream_docx_text(docx_content)
+                paragraphs = list(_iter_nonempty(all_paragraphs))
+                combined_text = "\n\n".join(chain(paragraphs, table_rows))
+                metadata.update(
+                    total_paragraphs=len(all_paragraphs),
+                    paragraphs_with_text=len(paragraphs),
+                    total_tables=table_count,
+                    extraction_method="xml-stream"
+                )
                 
-                full_text.extend(paragraphs)
-                
-                # Extract tables
-                metadata["total_tables"] = len(doc.tables)
-                for table in doc.tables:
-                    for row in table.rows:
-                        row_text = []
-                        for cell in row.cells:
-                            if cell.text.strip():
-                                row_text.append(cell.text.strip())
-                        if row_text:
-                            full_text.append(" | ".join(row_text))
-                
-                combined_text = "\n\n".join(full_text)
+            except Exception:
+                # Unreadable or unusual file: fall back to python-docx, then docx2txt
+                combined_text = None
+            
+            try:
+                if combined_text is None:
+                    doc = _get_document(docx_content)
+                    
+                    # Extract paragraphs
+                    all_paragraphs = doc.paragraphs
+                    paragraphs = list(_iter_nonempty(paragraph.text for paragraph in all_paragraphs))
+                    metadata["total_paragraphs"] = len(all_paragraphs)
+                    metadata["paragraphs_with_text"] = len(paragraphs)
+                    
+                    # Extract tables
+                    tables = doc.tables
+                    metadata["total_tables"] = len(tables)
+                    combined_text = "\n\n".join(chain(paragraphs, _iter_table_rows(tables)))
                 
             except Exception as e:
                 # Fallback to docx2txt
                 try:
-                    docx_file.seek(0)
-                    combined_text = docx2txt.process(docx_file)
+                    combined_text = docx2txt.process(io.BytesIO(docx_content))
                     metadata["extraction_method"] = "docx2txt"
                     metadata["total_paragraphs"] = len(combined_text.split('\n'))
                 except Exception as e2:
                     error_message = f"Error parsing DOCX: {str(e)}"
                     return "", error_message, metadata
             
-            if not combined_text or combined_text.strip() == "":
+            if not combined_text or combined_text.isspace():
                 return "", "No text could be extracted from the DOCX file", metadata
             
             # Clean text
-            cleaned_text = remove_encoding_issues(combined_text)
-            cleaned_text = normalize_whitespace(cleaned_text)
-            cleaned_text = clean_text(cleaned_text)
+            cleaned_text = clean_extracted_text(combined_text)
             
             return cleaned_text, None, metadata
             
@@ -323,8 +530,7 @@ class DOCXParser:
             Dictionary with DOCX metadata
         """
         try:
-            docx_file = io.BytesIO(docx_content)
-            doc = Document(docx_file)
+            doc = _get_document(docx_content)
             
             metadata = {
                 "total_paragraphs": len(doc.paragraphs),
@@ -373,7 +579,11 @@ class TextInputService:
         if not text or not isinstance(text, str):
             return False, "Text is required and must be a string"
         
-        text_length = len(text.strip())
+        text_length = len(text)
+        
+        # Only build a stripped copy when there is whitespace at either end to strip
+        if text_length >= TextInputService.MIN_TEXT_LENGTH and (text[0].isspace() or text[-1].isspace()):
+            text_length = len(text.strip())
         
         if text_length < TextInputService.MIN_TEXT_LENGTH:
             return False, f"Text must be at least {TextInputService.MIN_TEXT_LENGTH} characters long"
@@ -410,8 +620,7 @@ class TextInputService:
             return None, error_message
         
         # Clean and normalize text
-        cleaned_text = normalize_whitespace(text)
-        cleaned_text = clean_text(cleaned_text)
+        cleaned_text = clean_text(text)
         
         # Generate text ID
         text_id = generate_file_id()
@@ -420,23 +629,14 @@ class TextInputService:
         if not filename:
             filename = f"{source_type}_{text_id[:8]}.txt"
         
-        # Convert text to bytes for storage
-        text_bytes = cleaned_text.encode('utf-8')
-        file_size = len(text_bytes)
-        
-        # Store in file storage (treating as a text file)
-        file_data = file_storage.store_file(
+        # Store as an already-parsed text file (no bytes copy of the text is kept)
+        file_storage.store_text(
             file_id=text_id,
             filename=filename,
-            file_type="txt",
-            content=text_bytes,
-            file_size=file_size,
+            text=cleaned_text,
             source_type=source_type
         )
         
-        # Store cleaned text directly (so it's already "parsed")
-        file_storage.update_file_text(text_id, cleaned_text)
-        
         return text_id, None
     
     @staticmethod
@@ -455,7 +655,7 @@ class TextInputService:
         if not file_data:
             return None, "Text not found or session expired"
         
-        text = file_data.get("parsed_text")
+        text = file_storage.get_parsed_text(text_id)
         
         if not text:
             return None, "Text not available"
@@ -467,13 +667,37 @@ class TextInputService:
 # File Parser Service (Router)
 # ============================================================================
 
+# Text extracted from recently parsed content, keyed by (file_type, content digest),
+# so an identical upload (e.g. one JD compared against many resumes) is only parsed
+# once. Shared by the parse endpoint and FileParserService.
+_extracted_text_cache: TTLCache = TTLCache(maxsize=64, ttl=3600)
+_extracted_text_cache_lock = threading.Lock()
+
+
+def extracted_text_cache_key(file_type: str, content: bytes) -> Tuple[str, bytes]:
+    """Build the extracted-text cache key for raw file content."""
+    return file_type.lower(), hashlib.blake2b(content, digest_size=16).digest()
+
+
+def get_cached_text(cache_key: Tuple[str, bytes]) -> Optional[str]:
+    """Get previously extracted text for a cache key, or None."""
+    with _extracted_text_cache_lock:
+        return _extracted_text_cache.get(cache_key)
+
+
+def cache_extracted_text(cache_key: Tuple[str, bytes], extracted_text: str) -> None:
+    """Remember the text extracted for a cache key."""
+    with _extracted_text_cache_lock:
+        _extracted_text_cache[cache_key] = extracted_text
+
+
 class FileParserService:
     """Service for parsing uploaded files."""
     
     def __init__(self):
-        """Initialize parsers."""
-        self.pdf_parser = PDFParser()
-        self.docx_parser = DOCXParser()
+        """Initialize parsers (the shared, stateless module-level instances)."""
+        self.pdf_parser = pdf_parser
+        self.docx_parser = docx_parser
     
     def parse_file(self, file_id: str) -> Tuple[bool, Optional[str]]:
         """
@@ -492,49 +716,71 @@ class FileParserService:
             return False, "File not found or session expired"
         
         # Check if already parsed
-        if file_data.get("parsed_text"):
+        if file_data.get("parsed_text_length") is not None:
             return True, None
         
-        file_type = file_data["file_type"].lower()
-        content = file_data["content"]
-        
-        # Route to appropriate parser
-        if file_type == "pdf":
-            extracted_text, error = self.pdf_parser.extract_text(content)
+        # Reuse the text of identical content parsed earlier
+        cache_key = extracted_text_cache_key(file_data["file_type"], file_data["content"])
+        extracted_text = get_cached_text(cache_key)
+        if extracted_text is None:
+            extracted_text, error = self.extract_text(file_data["file_type"], file_data["content"])
             
             if error:
                 return False, error
+            cache_extracted_text(cache_key, extracted_text)
+        
+        # Store parsed text
+        file_storage.update_file_text(file_id, extracted_text)
+        return True, None
+    
+    def extract_text(self, file_type: str, content: bytes) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Extract cleaned text from raw file content.
+        
+        Touches no shared state, so it is safe to run in a worker process.
+        
+        Args:
+            file_type: File extension without the dot (pdf, docx, txt)
+            content: Raw file bytes
             
-            # Store parsed text
-            file_storage.update_file_text(file_id, extracted_text)
-            return True, None
+        Returns:
+            Tuple of (extracted_text, error_message)
+        """
+        file_type = file_type.lower()
+        
+        # Route to appropriate parser
+        if file_type == "pdf":
+            return self.pdf_parser.extract_text(content)
             
         elif file_type == "docx":
-            # Use DOCX parser
-            extracted_text, error = self.docx_parser.extract_text(content)
-            
-            if error:
-                return False, error
-            
-            # Store parsed text
-            file_storage.update_file_text(file_id, extracted_text)
-            return True, None
+            return self.docx_parser.extract_text(content)
             
         elif file_type == "txt":
             # Plain text - just decode and clean
             try:
                 text = content.decode('utf-8')
-                cleaned_text = normalize_whitespace(text)
-                cleaned_text = clean_text(cleaned_text)
-                
-                file_storage.update_file_text(file_id, cleaned_text)
-                return True, None
+                cleaned_text = clean_text(text)
+                return cleaned_text, None
                 
             except Exception as e:
-                return False, f"Error parsing text file: {str(e)}"
+                return None, f"Error parsing text file: {str(e)}"
         
         else:
-            return False, f"Unsupported file type: {file_type}"
+            return None, f"Unsupported file type: {file_type}"
+
+
+def extract_text_in_worker(file_type: str, content: bytes) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Top-level entry point for process pool workers.
+    
+    Args:
+        file_type: File extension without the dot (pdf, docx, txt)
+        content: Raw file bytes
+        
+    Returns:
+        Tuple of (extracted_text, error_message)
+    """
+    return file_parser_service.extract_text(file_type, content)
 
 
 # ============================================================================
@@ -548,3 +794,7 @@ docx_parser = DOCXParser()
 # Service instances
 file_parser_service = FileParserService()
 text_input_service = TextInputService()
+
+# PDF/DOCX extraction is CPU-bound and holds the GIL, so it runs in worker
+# processes. Workers only see the raw bytes; callers store the text back.
+parse_pool = ProcessPoolExecutor(max_workers=os.cpu_count())
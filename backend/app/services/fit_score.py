@@ -1,7 +1,8 @@
 """
 Fit score calculation module for evaluating resume-job description compatibility.
 """
-from typing import Optional, Dict, List, Tuple
+import re
+from typing import Optional, Dict, Iterable, List, Tuple
 from app.models.schemas import (
     FitScoreBreakdown,
     GapAnalysis,
@@ -15,6 +16,60 @@ from app.models.skill_taxonomy import SkillCategory
 from app.services.gap_analysis import GapAnalyzer
 
 
+# Category frozensets, bound at module level for the counting loop
+# (categories are stored as plain strings; SkillCategory is a str enum)
+_TECHNICAL_CATEGORIES = GapAnalyzer.TECHNICAL_CATEGORIES
+_SOFT_SKILL_CATEGORIES = GapAnalyzer.SOFT_SKILL_CATEGORIES
+
+# Common degree name variations (substring, normalized name), checked in order
+_DEGREE_MAPPING = (
+    ("bachelor", "bachelor"),
+    ("bachelor's", "bachelor"),
+    ("bs", "bachelor"),
+    ("ba", "bachelor"),
+    ("b.sc", "bachelor"),
+    ("master", "master"),
+    ("master's", "master"),
+    ("ms", "master"),
+    ("ma", "master"),
+    ("m.sc", "master"),
+    ("phd", "phd"),
+    ("ph.d", "phd"),
+    ("doctorate", "phd"),
+    ("doctor", "phd"),
+)
+
+# _DEGREE_MAPPING as one regex: a lookahead branch per normalized name, in
+# mapping order, so the first name with any variation present wins
+_DEGREE_NAMES = tuple(dict.fromkeys(value for _, value in _DEGREE_MAPPING))
+_DEGREE_RE = re.compile("|".join(
+    "^(?=.*?(?:%s))()" % "|".join(
+        re.escape(key) for key, value in _DEGREE_MAPPING if value == name
+    )
+    for name in _DEGREE_NAMES
+), re.DOTALL)
+
+
+def _count_categories(skills: Iterable[Skill]) -> Tuple[int, int]:
+    """
+    Count technical and soft skills in a single pass.
+    
+    Args:
+        skills: Skills to count
+        
+    Returns:
+        Tuple of (technical_count, soft_skills_count)
+    """
+    technical = soft = 0
+    for skill in skills:
+        category = skill.category
+        if category in _TECHNICAL_CATEGORIES:
+            technical += 1
+        elif category in _SOFT_SKILL_CATEGORIES:
+            soft += 1
+    return technical, soft
+
+
 class FitScoreCalculator:
     """Calculate fit scores between resume and job description."""
     
@@ -72,14 +127,27 @@ class FitScoreCalculator:
         else:
             overall_score = 0.0
         
-        # Calculate technical and soft skills scores (for breakdown display)
-        technical_score = FitScoreCalculator._calculate_technical_score(
-            gap_analysis, jd_skills
-        )
-        
-        soft_skills_score = FitScoreCalculator._calculate_soft_skills_score(
-            gap_analysis, jd_skills
-        )
+        # Calculate technical and soft skills scores (for breakdown display),
+        # counting each skill list once
+        if not jd_skills.skills:
+            # No JD skills at all: nothing to analyze
+            technical_score = soft_skills_score = 0.0
+        else:
+            jd_technical, jd_soft = _count_categories(jd_skills.skills)
+            if matched_count:
+                matched_technical, matched_soft = _count_categories(
+                    match.skill for match in gap_analysis.matched_skills
+                )
+            else:
+                matched_technical = matched_soft = 0
+            
+            technical_score = FitScoreCalculator._calculate_technical_score(
+                matched_technical, jd_technical, has_jd_skills=True
+            )
+            
+            soft_skills_score = FitScoreCalculator._calculate_soft_skills_score(
+                matched_soft, jd_soft, has_jd_skills=True
+            )
         
         # Calculate education score (optional)
         education_score = None
@@ -124,100 +192,72 @@ class FitScoreCalculator:
             Tuple of (technical_weight, soft_skills_weight)
         """
         # Count technical and soft skills in JD
-        jd_technical = [
-            skill for skill in jd_skills.skills
-            if skill.category in GapAnalyzer.TECHNICAL_CATEGORIES
-        ]
+        jd_technical, jd_soft = _count_categories(jd_skills.skills)
         
-        jd_soft = [
-            skill for skill in jd_skills.skills
-            if skill.category in GapAnalyzer.SOFT_SKILL_CATEGORIES
-        ]
-        
-        total_relevant_skills = len(jd_technical) + len(jd_soft)
+        total_relevant_skills = jd_technical + jd_soft
         
         # If no relevant skills found, use equal weights (50/50)
         if total_relevant_skills == 0:
             return (0.5, 0.5)
         
         # Calculate weights based on proportions
-        technical_weight = len(jd_technical) / total_relevant_skills
-        soft_skills_weight = len(jd_soft) / total_relevant_skills
+        technical_weight = jd_technical / total_relevant_skills
+        soft_skills_weight = jd_soft / total_relevant_skills
         
         return (technical_weight, soft_skills_weight)
     
     @staticmethod
     def _calculate_technical_score(
-        gap_analysis: GapAnalysis,
-        jd_skills: SkillExtractionResult
+        matched_technical: int,
+        jd_technical: int,
+        has_jd_skills: bool
     ) -> float:
         """
         Calculate technical skills match score.
         
         Args:
-            gap_analysis: GapAnalysis result
-            jd_skills: Job description skills
+            matched_technical: Number of matched technical skills
+            jd_technical: Number of technical skills in the job description
+            has_jd_skills: Whether the job description has any skills at all
             
         Returns:
             Technical skills score (0-100)
         """
-        # Get technical skills from JD
-        jd_technical = [
-            skill for skill in jd_skills.skills
-            if skill.category in GapAnalyzer.TECHNICAL_CATEGORIES
-        ]
-        
         # If no JD skills at all, return 0 (no data to analyze)
-        if not jd_skills.skills:
+        if not has_jd_skills:
             return 0.0
         
         if not jd_technical:
             return 100.0  # No technical requirements means perfect match
         
-        # Count matched technical skills
-        matched_technical = [
-            match for match in gap_analysis.matched_skills
-            if match.skill.category in GapAnalyzer.TECHNICAL_CATEGORIES
-        ]
-        
-        score = (len(matched_technical) / len(jd_technical)) * 100.0
+        score = (matched_technical / jd_technical) * 100.0
         return min(100.0, max(0.0, score))
     
     @staticmethod
     def _calculate_soft_skills_score(
-        gap_analysis: GapAnalysis,
-        jd_skills: SkillExtractionResult
+        matched_soft: int,
+        jd_soft: int,
+        has_jd_skills: bool
     ) -> float:
         """
         Calculate soft skills match score.
         
         Args:
-            gap_analysis: GapAnalysis result
-            jd_skills: Job description skills
+            matched_soft: Number of matched soft skills
+            jd_soft: Number of soft skills in the job description
+            has_jd_skills: Whether the job description has any skills at all
             
         Returns:
             Soft skills score (0-100)
         """
-        # Get soft skills from JD
-        jd_soft = [
-            skill for skill in jd_skills.skills
-            if skill.category in GapAnalyzer.SOFT_SKILL_CATEGORIES
-        ]
-        
         # If no JD skills at all, return 0 (no data to analyze)
-        if not jd_skills.skills:
+        if not has_jd_skills:
             return 0.0
         
         if not jd_soft:
             return 100.0  # No soft skill requirements means perfect match
         
-        # Count matched soft skills
-        matched_soft = [
-            match for match in gap_analysis.matched_skills
-            if match.skill.category in GapAnalyzer.SOFT_SKILL_CATEGORIES
-        ]
-        
-        score = (len(matched_soft) / len(jd_soft)) * 100.0
+        score = (matched_soft / jd_soft) * 100.0
         return min(100.0, max(0.0, score))
     
     @staticmethod
@@ -238,9 +278,15 @@ class FitScoreCalculator:
         if not jd_education:
             return None
         
-        # Check required education first
-        required_education = [edu for edu in jd_education if edu.required]
+        # Split required and preferred entries in one pass (an entry may be both)
+        required_education, preferred_education = [], []
+        for edu in jd_education:
+            if edu.required:
+                required_education.append(edu)
+            if edu.preferred:
+                preferred_education.append(edu)
         
+        # Check required education first
         if required_education:
             # Check if resume meets required education
             matches = FitScoreCalculator._match_education(
@@ -248,7 +294,6 @@ class FitScoreCalculator:
             )
             if matches:
                 # Check preferred education
-                preferred_education = [edu for edu in jd_education if edu.preferred]
                 if preferred_education:
                     preferred_matches = FitScoreCalculator._match_education(
                         resume_education, preferred_education
@@ -262,7 +307,6 @@ class FitScoreCalculator:
                 return 0.0
         
         # Only preferred education
-        preferred_education = [edu for edu in jd_education if edu.preferred]
         if preferred_education:
             matches = FitScoreCalculator._match_education(
                 resume_education, preferred_education
@@ -287,25 +331,35 @@ class FitScoreCalculator:
         Returns:
             List of matched education requirements
         """
+        # Normalize each resume entry once rather than once per JD entry
+        resume_normalized = [
+            (
+                FitScoreCalculator._normalize_degree(resume_edu.degree),
+                FitScoreCalculator._normalize_field(resume_edu.field) if resume_edu.field else None
+            )
+            for resume_edu in resume_education
+            if resume_edu.degree
+        ]
+        
         matches = []
         
         for jd_edu in jd_education:
-            for resume_edu in resume_education:
+            if not jd_edu.degree:
+                continue
+            jd_degree = FitScoreCalculator._normalize_degree(jd_edu.degree)
+            jd_field = FitScoreCalculator._normalize_field(jd_edu.field) if jd_edu.field else None
+            
+            for resume_degree, resume_field in resume_normalized:
                 # Check degree match
-                if jd_edu.degree and resume_edu.degree:
-                    if FitScoreCalculator._normalize_degree(
-                        jd_edu.degree
-                    ) == FitScoreCalculator._normalize_degree(resume_edu.degree):
-                        # Check field match if specified
-                        if jd_edu.field:
-                            if resume_edu.field and FitScoreCalculator._normalize_field(
-                                jd_edu.field
-                            ) == FitScoreCalculator._normalize_field(resume_edu.field):
-                                matches.append(jd_edu)
-                                break
-                        else:
+                if jd_degree == resume_degree:
+                    # Check field match if specified
+                    if jd_field is not None:
+                        if resume_field is not None and jd_field == resume_field:
                             matches.append(jd_edu)
                             break
+                    else:
+                        matches.append(jd_edu)
+                        break
         
         return matches
     
@@ -315,26 +369,9 @@ class FitScoreCalculator:
         degree_lower = degree.lower().strip()
         
         # Map common variations
-        degree_mapping = {
-            "bachelor": "bachelor",
-            "bachelor's": "bachelor",
-            "bs": "bachelor",
-            "ba": "bachelor",
-            "b.sc": "bachelor",
-            "master": "master",
-            "master's": "master",
-            "ms": "master",
-            "ma": "master",
-            "m.sc": "master",
-            "phd": "phd",
-            "ph.d": "phd",
-            "doctorate": "phd",
-            "doctor": "phd",
-        }
-        
-        for key, value in degree_mapping.items():
-            if key in degree_lower:
-                return value
+        match = _DEGREE_RE.match(degree_lower)
+        if match:
+            return _DEGREE_NAMES[match.lastindex - 1]
         
         return degree_lower
     
@@ -361,9 +398,15 @@ class FitScoreCalculator:
         if not jd_certifications:
             return None
         
-        # Check required certifications first
-        required_certs = [cert for cert in jd_certifications if cert.required]
+        # Split required and preferred entries in one pass (an entry may be both)
+        required_certs, preferred_certs = [], []
+        for cert in jd_certifications:
+            if cert.required:
+                required_certs.append(cert)
+            if cert.preferred:
+                preferred_certs.append(cert)
         
+        # Check required certifications first
         if required_certs:
             # Check if resume has required certifications
             matches = FitScoreCalculator._match_certifications(
@@ -371,7 +414,6 @@ class FitScoreCalculator:
             )
             if matches:
                 # Check preferred certifications
-                preferred_certs = [cert for cert in jd_certifications if cert.preferred]
                 if preferred_certs:
                     preferred_matches = FitScoreCalculator._match_certifications(
                         resume_certifications, preferred_certs
@@ -385,7 +427,6 @@ class FitScoreCalculator:
                 return 0.0
         
         # Only preferred certifications
-        preferred_certs = [cert for cert in jd_certifications if cert.preferred]
         if preferred_certs:
             matches = FitScoreCalculator._match_certifications(
                 resume_certifications, preferred_certs
@@ -410,29 +451,36 @@ class FitScoreCalculator:
         Returns:
             List of matched certification requirements
         """
+        # Normalize each resume entry once, indexing the distinct names by issuer
+        # so a JD cert with an issuer is only compared against that issuer's certs
+        resume_names = set()
+        resume_names_by_issuer: Dict[str, set] = {}
+        for resume_cert in resume_certifications:
+            resume_name = FitScoreCalculator._normalize_cert_name(resume_cert.name)
+            resume_names.add(resume_name)
+            if resume_cert.issuer:
+                issuer = FitScoreCalculator._normalize_issuer(resume_cert.issuer)
+                resume_names_by_issuer.setdefault(issuer, set()).add(resume_name)
+        
         matches = []
         
         for jd_cert in jd_certifications:
             cert_name_normalized = FitScoreCalculator._normalize_cert_name(jd_cert.name)
             
-            for resume_cert in resume_certifications:
-                resume_name_normalized = FitScoreCalculator._normalize_cert_name(
-                    resume_cert.name
+            # Check issuer if specified
+            if jd_cert.issuer:
+                candidates = resume_names_by_issuer.get(
+                    FitScoreCalculator._normalize_issuer(jd_cert.issuer), ()
                 )
-                
-                # Check if names match (fuzzy match)
-                if cert_name_normalized in resume_name_normalized or \
-                   resume_name_normalized in cert_name_normalized:
-                    # Check issuer if specified
-                    if jd_cert.issuer:
-                        if resume_cert.issuer and FitScoreCalculator._normalize_issuer(
-                            jd_cert.issuer
-                        ) == FitScoreCalculator._normalize_issuer(resume_cert.issuer):
-                            matches.append(jd_cert)
-                            break
-                    else:
-                        matches.append(jd_cert)
-                        break
+            else:
+                candidates = resume_names
+            
+            # Exact name match is a set lookup; otherwise check if names match (fuzzy match)
+            if cert_name_normalized in candidates or any(
+                cert_name_normalized in resume_name or resume_name in cert_name_normalized
+                for resume_name in candidates
+            ):
+                matches.append(jd_cert)
         
         return matches
     
@@ -11,7 +11,7 @@ class GapAnalyzer:
     """Analyze gaps between resume and job description skills."""
     
     # Technical skill categories
-    TECHNICAL_CATEGORIES = [
+    TECHNICAL_CATEGORIES = frozenset({
         SkillCategory.PROGRAMMING_LANGUAGES,
         SkillCategory.FRAMEWORKS_LIBRARIES,
         SkillCategory.TOOLS_PLATFORMS,
@@ -23,24 +23,24 @@ class GapAnalyzer:
         SkillCategory.BLOCKCHAIN,
         SkillCategory.CYBERSECURITY,
         SkillCategory.DATA_SCIENCE,
-    ]
+    })
     
     # Soft skill categories
-    SOFT_SKILL_CATEGORIES = [
+    SOFT_SKILL_CATEGORIES = frozenset({
         SkillCategory.LEADERSHIP,
         SkillCategory.COMMUNICATION,
         SkillCategory.COLLABORATION,
         SkillCategory.PROBLEM_SOLVING,
         SkillCategory.ANALYTICAL_THINKING,
-    ]
+    })
     
     # Methodology categories
-    METHODOLOGY_CATEGORIES = [
+    METHODOLOGY_CATEGORIES = frozenset({
         SkillCategory.AGILE,
         SkillCategory.SCRUM,
         SkillCategory.CI_CD,
         SkillCategory.DESIGN_THINKING,
-    ]
+    })
     
     @staticmethod
     def analyze_gap(
@@ -0,0 +1,84 @@
+"""
+Google ID token verification with connection reuse and caching.
+"""
+import re
+import threading
+import time
+from typing import Dict, Optional, Tuple
+import requests
+from google.auth import transport
+from google.auth.transport.requests import Request
+from google.oauth2 import id_token
+from app.services.token_cache import TokenCache
+
+
+# Cap on how long a verified Google ID token is reused
+GOOGLE_TOKEN_CACHE_TTL_SECONDS = 60
+
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+
+class CachingCertsRequest(transport.Request):
+    """
+    Transport that pools connections and caches successful GET responses.
+
+    Google's signing-cert endpoints send `Cache-Control: max-age`, so the
+    certificates are only refetched once they go stale.
+    """
+
+    def __init__(self, session: Optional[requests.Session] = None):
+        """Initialize the transport with a pooled requests session."""
+        self._request = Request(session=session or requests.Session())
+        self._responses: Dict[str, Tuple[transport.Response, float]] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, url, method="GET", body=None, headers=None, timeout=None, **kwargs):
+        """Make an HTTP request, serving cacheable GETs from memory."""
+        if method != "GET" or body is not None:
+            return self._request(url, method=method, body=body, headers=headers, timeout=timeout, **kwargs)
+
+        now = time.time()
+        with self._lock:
+            cached = self._responses.get(url)
+        if cached is not None and now < cached[1]:
+            return cached[0]
+
+        response = self._request(url, method=method, headers=headers, timeout=timeout, **kwargs)
+        if response.status == 200:
+            match = _MAX_AGE_RE.search(response.headers.get("cache-control", ""))
+            if match:
+                with self._lock:
+                    self._responses[url] = (response, now + int(match.group(1)))
+        return response
+
+
+# Shared transport and verified-token cache
+_google_request = CachingCertsRequest()
+_google_token_cache = TokenCache(max_entries=10_000, ttl_seconds=GOOGLE_TOKEN_CACHE_TTL_SECONDS)
+
+
+def verify_google_id_token(token: str, client_id: Optional[str] = None) -> dict:
+    """
+    Verify a Google ID token and return its claims.
+
+    A successfully verified token is reused for up to a minute (never past
+    its own `exp`), since SPAs resend the same token across refreshes.
+
+    Args:
+        token: Google ID token (JWT)
+        client_id: Expected audience, or None to skip the audience check
+
+    Returns:
+        Decoded token claims
+
+    Raises:
+        ValueError: If the token is invalid
+    """
+    cache_key = f"{client_id or ''}:{token}"
+    cache_hit, idinfo = _google_token_cache.lookup(cache_key)
+    if cache_hit and idinfo is not None:
+        return idinfo
+
+    idinfo = id_token.verify_oauth2_token(token, _google_request, client_id)
+    _google_token_cache.store(cache_key, idinfo)
+    return idinfo
@@ -3,11 +3,18 @@ PDF Report Generation Service using ReportLab.
 """
 from io import BytesIO
 from datetime import datetime
+from functools import lru_cache
+from itertools import zip_longest
+from typing import BinaryIO, Optional
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
+from reportlab.lib.utils import simpleSplit
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.pdfmetrics import stringWidth
 from reportlab.platypus import (
+    Flowable,
     SimpleDocTemplate,
     Paragraph,
     Spacer,
@@ -21,6 +28,118 @@ from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY
 from app.models.schemas import SkillGapReport, FitScoreBreakdown, GapAnalysis
 
 
+# Standard fonts the report uses. Loading their metrics at import (which now
+# happens in the PDF pool workers) keeps font setup out of the first render.
+_REPORT_FONTS = ("Times-Roman", "Times-Bold", "Times-Italic", "Helvetica", "Helvetica-Bold")
+for _font_name in _REPORT_FONTS:
+    pdfmetrics.getFont(_font_name)
+
+# Skill column geometry, matching the former three-column skill Table
+_SKILL_COLUMN_WIDTH = 2.1 * inch
+_SKILL_CELL_H_PADDING = 6
+_SKILL_CELL_V_PADDING = 2
+
+
+@lru_cache(maxsize=64)
+def _category_label(category: str) -> str:
+    """Turn a skill category id like "cloud_services" into "Cloud Services"."""
+    return category.replace("_", " ").title()
+
+
+def _course_link_markup(link: str) -> str:
+    """Link cell markup for a course URL, or "N/A" when there is none."""
+    return f'<link href="{link}">Open</link>' if link else "N/A"
+
+
+def _wrap_text(text: str, font_name: str, font_size: float, width: float) -> list[str]:
+    """Wrap plain text to a width, breaking words that are too long for a line on their own."""
+    lines = []
+    for line in simpleSplit(text, font_name, font_size, width):
+        if stringWidth(line, font_name, font_size) <= width:
+            lines.append(line)
+            continue
+        start = 0
+        used = 0.0
+        for i, char in enumerate(line):
+            char_width = stringWidth(char, font_name, font_size)
+            if used + char_width > width and i > start:
+                lines.append(line[start:i])
+                start = i
+                used = 0.0
+            used += char_width
+        lines.append(line[start:])
+    return lines
+
+
+class SkillColumnsFlowable(Flowable):
+    """
+    Skill bullet lists laid out in fixed-width columns, drawn straight onto the canvas.
+
+    Every cell is short plain text in one style, so the lines are wrapped
+    once up front and emitted as a single text object instead of building a
+    Paragraph per skill inside a Table. Splits between rows across pages.
+    """
+
+    def __init__(self, rows: list, style: ParagraphStyle):
+        """
+        Initialize the flowable.
+
+        Args:
+            rows: Table rows; each cell is a list of wrapped text lines (empty for padding)
+            style: ParagraphStyle supplying font, size, leading and left indent
+        """
+        super().__init__()
+        self.rows = rows
+        # Not "style": Flowable would pick up its spaceBefore/spaceAfter
+        self.text_style = style
+        self.hAlign = "LEFT"
+        self.row_heights = [
+            max(len(lines) for lines in row) * style.leading + 2 * _SKILL_CELL_V_PADDING
+            for row in rows
+        ]
+
+    def wrap(self, availWidth, availHeight):
+        self.width = _SKILL_COLUMN_WIDTH * len(self.rows[0])
+        self.height = sum(self.row_heights)
+        return self.width, self.height
+
+    def split(self, availWidth, availHeight):
+        used = 0
+        for count, row_height in enumerate(self.row_heights):
+            used += row_height
+            if used > availHeight:
+                break
+        else:
+            return [self]
+        if count == 0:
+            return []
+        return [
+            SkillColumnsFlowable(self.rows[:count], self.text_style),
+            SkillColumnsFlowable(self.rows[count:], self.text_style),
+        ]
+
+    def draw(self):
+        style = self.text_style
+        leading = style.leading
+        text = self.canv.beginText()
+        text.setFont(style.fontName, style.fontSize, leading)
+        text.setFillColor(style.textColor)
+
+        left = _SKILL_CELL_H_PADDING + style.leftIndent
+        # First baseline sits one font size below the cell's top padding, as in Paragraph
+        baseline = self.height - _SKILL_CELL_V_PADDING - style.fontSize
+        for row, row_height in zip(self.rows, self.row_heights):
+            for col, lines in enumerate(row):
+                x = left + col * _SKILL_COLUMN_WIDTH
+                y = baseline
+                for line in lines:
+                    text.setTextOrigin(x, y)
+                    text.textOut(line)
+                    y -= leading
+            baseline -= row_height
+        self.canv.drawText(text)
+
+
 class PDFReportGenerator:
     """Generate PDF reports from skill gap analysis data."""
 
@@ -98,17 +217,70 @@ class PDFReportGenerator:
                 )
             )
 
-    def generate_pdf(self, report: SkillGapReport) -> BytesIO:
+        # Skill bullet style - Times New Roman
+        if "SkillBullet" not in self.styles.byName:
+            self.styles.add(
+                ParagraphStyle(
+                    name="SkillBullet",
+                    parent=self.styles["Normal"],
+                    fontSize=10,
+                    fontName="Times-Roman",
+                    leftIndent=10,
+                    spaceAfter=4,
+                )
+            )
+
+        # Report date style - Times New Roman
+        if "DateStyle" not in self.styles.byName:
+            self.styles.add(
+                ParagraphStyle(
+                    name="DateStyle",
+                    parent=self.styles["Normal"],
+                    fontSize=11,
+                    fontName="Times-Roman",
+                )
+            )
+
+        # Course link style - Times New Roman
+        if "CourseLink" not in self.styles.byName:
+            self.styles.add(
+                ParagraphStyle(
+                    name="CourseLink",
+                    parent=self.styles["Normal"],
+                    textColor=colors.HexColor("#1d4ed8"),
+                    fontSize=9,
+                    fontName="Times-Roman",
+                )
+            )
+
+        # Page footer style - Times New Roman
+        if "Footer" not in self.styles.byName:
+            self.styles.add(
+                ParagraphStyle(
+                    name="Footer",
+                    parent=self.styles["Normal"],
+                    fontSize=9,
+                    alignment=TA_CENTER,
+                    textColor=colors.HexColor("#94a3b8"),
+                    fontName="Times-Italic",
+                )
+            )
+
+    def generate_pdf(
+        self, report: SkillGapReport, output: Optional[BinaryIO] = None
+    ) -> Optional[BytesIO]:
         """
         Generate PDF report from SkillGapReport.
         
         Args:
             report: SkillGapReport object
+            output: Optional writable binary file to render into instead of
+                an in-memory buffer (e.g. a temp file or response sink)
             
         Returns:
-            BytesIO buffer containing PDF data
+            BytesIO buffer containing PDF data, or None if output was given
         """
-        buffer = BytesIO()
+        buffer = BytesIO() if output is None else output
         doc = SimpleDocTemplate(
             buffer,
             pagesize=letter,
@@ -136,17 +308,7 @@ class PDFReportGenerator:
         # Build PDF
         def draw_footer(canvas_obj, doc_obj):
             canvas_obj.saveState()
-            footer_text = Paragraph(
-                "Generated by SkillSync",
-                ParagraphStyle(
-                    name="Footer",
-                    parent=self.styles["Normal"],
-                    fontSize=9,
-                    alignment=TA_CENTER,
-                    textColor=colors.HexColor("#94a3b8"),
-                    fontName="Times-Italic",
-                ),
-            )
+            footer_text = Paragraph("Generated by SkillSync", self.styles["Footer"])
             footer_width, footer_height = footer_text.wrap(doc_obj.width, doc_obj.bottomMargin)
             footer_text.drawOn(
                 canvas_obj,
@@ -160,6 +322,8 @@ class PDFReportGenerator:
             onFirstPage=draw_footer,
             onLaterPages=draw_footer,
         )
+        if output is not None:
+            return None
         buffer.seek(0)
         return buffer
 
@@ -174,13 +338,7 @@ class PDFReportGenerator:
 
         # Date - Times New Roman
         date_str = report.generated_at.strftime("%B %d, %Y at %I:%M %p")
-        date_style = ParagraphStyle(
-            name="DateStyle",
-            parent=self.styles["Normal"],
-            fontSize=11,
-            fontName="Times-Roman",
-        )
-        date_para = Paragraph(f"Generated: {date_str}", date_style)
+        date_para = Paragraph(f"Generated: {date_str}", self.styles["DateStyle"])
         elements.append(date_para)
         elements.append(Spacer(1, 0.3 * inch))
 
@@ -194,19 +352,23 @@ class PDFReportGenerator:
         header = Paragraph("Executive Summary", self.styles["SectionHeader"])
         elements.append(header)
 
+        fit_score = report.fit_score
+        overall_score = fit_score.overall_score
+        score_str = f"{overall_score:.1f}"
+        body_style = self.styles["ReportBodyText"]
+
         # Overall score
-        overall_score = report.fit_score.overall_score
-        score_text = f"<b>Overall Fit Score: {overall_score:.1f}%</b>"
-        score_para = Paragraph(score_text, self.styles["ReportBodyText"])
+        score_text = f"<b>Overall Fit Score: {score_str}%</b>"
+        score_para = Paragraph(score_text, body_style)
         elements.append(score_para)
         elements.append(Spacer(1, 0.1 * inch))
 
         # Summary text (removed the "This comprehensive report..." line)
         summary_text = f"""
-        You have achieved a <b>{overall_score:.1f}%</b> overall fit score, with <b>{report.fit_score.matched_count}</b> matched skills,
-        <b>{report.fit_score.missing_count}</b> missing skills, and <b>{len(report.gap_analysis.extra_skills)}</b> extra skills.
+        You have achieved a <b>{score_str}%</b> overall fit score, with <b>{fit_score.matched_count}</b> matched skills,
+        <b>{fit_score.missing_count}</b> missing skills, and <b>{len(report.gap_analysis.extra_skills)}</b> extra skills.
         """
-        summary_para = Paragraph(summary_text, self.styles["ReportBodyText"])
+        summary_para = Paragraph(summary_text, body_style)
         elements.append(summary_para)
         elements.append(Spacer(1, 0.1 * inch))
 
@@ -222,7 +384,7 @@ class PDFReportGenerator:
             interpretation = None
 
         if interpretation:
-            interpretation_para = Paragraph(f"<i>{interpretation}</i>", self.styles["ReportBodyText"])
+            interpretation_para = Paragraph(f"<i>{interpretation}</i>", body_style)
             elements.append(interpretation_para)
             elements.append(Spacer(1, 0.2 * inch))
 
@@ -236,94 +398,82 @@ class PDFReportGenerator:
         elements.append(header)
 
         # Matched Skills
-        if gap_analysis.matched_skills:
-            matched_header = Paragraph(
-                "Matched Skills", self.styles["SubsectionHeader"]
-            )
-            elements.append(matched_header)
-
-            matched_text = f"""
-            You have <b>{len(gap_analysis.matched_skills)}</b> skills that match the job requirements.
-            """
-            matched_intro = Paragraph(matched_text, self.styles["ReportBodyText"])
-            elements.append(matched_intro)
-            elements.append(Spacer(1, 0.1 * inch))
-
-            # Create skill boxes (like in website) instead of bullet list
-            matched_skill_names = [match.skill.name for match in gap_analysis.matched_skills[:120]]
-            matched_columns = self._create_skill_columns(matched_skill_names)
-            elements.extend(matched_columns)
-
-            if len(gap_analysis.matched_skills) > 50:
-                remaining = len(gap_analysis.matched_skills) - 50
-                elements.append(
-                    Paragraph(
-                        f"... and {remaining} additional matched skills.",
-                        self.styles["ReportBodyText"],
-                    )
-                )
-            elements.append(Spacer(1, 0.15 * inch))
+        matched = gap_analysis.matched_skills
+        if matched:
+            elements.extend(self._create_skill_group(
+                "Matched Skills",
+                f"You have <b>{len(matched)}</b> skills that match the job requirements.",
+                [match.skill.name for match in matched[:120]],
+                len(matched),
+                "additional matched skills.",
+            ))
 
         # Missing Skills
-        if gap_analysis.missing_skills:
-            missing_header = Paragraph(
-                "Missing Skills", self.styles["SubsectionHeader"]
-            )
-            elements.append(missing_header)
-
-            missing_text = f"""
-            The following <b>{len(gap_analysis.missing_skills)}</b> skills are required or preferred for this position 
-            but were not found in your resume:
-            """
-            missing_intro = Paragraph(missing_text, self.styles["ReportBodyText"])
-            elements.append(missing_intro)
-            elements.append(Spacer(1, 0.1 * inch))
-
-            # Create skill boxes (like in website) instead of bullet list
-            missing_skill_names = [skill.name for skill in gap_analysis.missing_skills[:120]]
-            missing_columns = self._create_skill_columns(missing_skill_names)
-            elements.extend(missing_columns)
-
-            if len(gap_analysis.missing_skills) > 50:
-                remaining = len(gap_analysis.missing_skills) - 50
-                elements.append(
-                    Paragraph(
-                        f"... and {remaining} additional missing skills.",
-                        self.styles["ReportBodyText"],
-                    )
-                )
-            elements.append(Spacer(1, 0.15 * inch))
+        missing = gap_analysis.missing_skills
+        if missing:
+            elements.extend(self._create_skill_group(
+                "Missing Skills",
+                f"The following <b>{len(missing)}</b> skills are required or preferred "
+                "for this position but were not found in your resume:",
+                [skill.name for skill in missing[:120]],
+                len(missing),
+                "additional missing skills.",
+            ))
 
         # Extra Skills
-        if gap_analysis.extra_skills:
-            extra_header = Paragraph("Extra Skills", self.styles["SubsectionHeader"])
-            elements.append(extra_header)
-
-            extra_text = f"""
-            You have <b>{len(gap_analysis.extra_skills)}</b> skills in your resume that are not explicitly mentioned 
-            in the job description. These can be valuable differentiators:
-            """
-            extra_intro = Paragraph(extra_text, self.styles["ReportBodyText"])
-            elements.append(extra_intro)
-            elements.append(Spacer(1, 0.1 * inch))
-
-            # Create skill boxes (like in website) instead of bullet list
-            extra_skill_names = [skill.name for skill in gap_analysis.extra_skills[:120]]
-            extra_columns = self._create_skill_columns(extra_skill_names)
-            elements.extend(extra_columns)
-
-            if len(gap_analysis.extra_skills) > 50:
-                remaining = len(gap_analysis.extra_skills) - 50
-                elements.append(
-                    Paragraph(
-                        f"... and {remaining} additional skills you can highlight.",
-                        self.styles["ReportBodyText"],
-                    )
-                )
-            elements.append(Spacer(1, 0.15 * inch))
+        extra = gap_analysis.extra_skills
+        if extra:
+            elements.extend(self._create_skill_group(
+                "Extra Skills",
+                f"You have <b>{len(extra)}</b> skills in your resume that are not explicitly "
+                "mentioned in the job description. These can be valuable differentiators:",
+                [skill.name for skill in extra[:120]],
+                len(extra),
+                "additional skills you can highlight.",
+            ))
 
         return elements
 
+    def _create_skill_group(
+        self,
+        title: str,
+        intro_text: str,
+        skill_names: list[str],
+        total: int,
+        overflow_text: str,
+    ) -> list:
+        """
+        Create one skill subsection: header, intro, skill columns and overflow note.
+
+        Args:
+            title: Subsection header text
+            intro_text: Intro paragraph markup
+            skill_names: Names to list in the skill columns
+            total: Total number of skills in the group
+            overflow_text: Note ending used when the group has more than 50 skills
+
+        Returns:
+            List of flowables
+        """
+        elements = [
+            Paragraph(title, self.styles["SubsectionHeader"]),
+            Paragraph(intro_text, self.styles["ReportBodyText"]),
+            Spacer(1, 0.1 * inch),
+        ]
+
+        # Create skill boxes (like in website) instead of bullet list
+        elements.extend(self._create_skill_columns(skill_names))
+
+        if total > 50:
+            elements.append(
+                Paragraph(
+                    f"... and {total - 50} {overflow_text}",
+                    self.styles["ReportBodyText"],
+                )
+            )
+        elements.append(Spacer(1, 0.15 * inch))
+        return elements
+
     def _create_course_recommendations_section(self, course_recommendations: list) -> list:
         """Create course recommendations section similar to homepage display."""
         elements = []
@@ -344,31 +494,20 @@ class PDFReportGenerator:
             )
             elements.append(no_recs)
         else:
-            link_style = ParagraphStyle(
-                name="CourseLink",
-                parent=self.styles["Normal"],
-                textColor=colors.HexColor("#1d4ed8"),
-                fontSize=9,
-                fontName="Times-Roman",
-            )
+            body_style = self.styles["ReportBodyText"]
+            link_style = self.styles["CourseLink"]
             # Create a table with course recommendations
             # Each row will have: Skill Name | Category | Platform | Link
             course_data = [["Skill", "Category", "Platform", "Link"]]
-            
-            for rec in course_recommendations:
-                skill_name = rec.get("skill_name", "N/A")
-                category = rec.get("category", "other").replace("_", " ").title()
-                platform = rec.get("platform", "Coursera")
-                link = rec.get("course_url", "")
-                
-                link_display = f'<link href="{link}">Open</link>' if link else "N/A"
-                
-                course_data.append([
-                    Paragraph(skill_name, self.styles["ReportBodyText"]),
-                    Paragraph(category, self.styles["ReportBodyText"]),
-                    Paragraph(platform, self.styles["ReportBodyText"]),
-                    Paragraph(link_display, link_style),
-                ])
+            course_data.extend(
+                [
+                    Paragraph(rec.get("skill_name", "N/A"), body_style),
+                    Paragraph(_category_label(rec.get("category", "other")), body_style),
+                    Paragraph(rec.get("platform", "Coursera"), body_style),
+                    Paragraph(_course_link_markup(rec.get("course_url", "")), link_style),
+                ]
+                for rec in course_recommendations
+            )
             
             col_widths = [2.2 * inch, 1.3 * inch, 1.1 * inch, 1.2 * inch]
             course_table = Table(course_data, colWidths=col_widths)
@@ -412,47 +551,22 @@ class PDFReportGenerator:
             return elements
 
         columns = 3
-        column_lists = [[] for _ in range(columns)]
-        for i, name in enumerate(skill_names):
-            column_lists[i % columns].append(name)
-
-        bullet_style = ParagraphStyle(
-            name="SkillBullet",
-            parent=self.styles["Normal"],
-            fontSize=10,
-            fontName="Times-Roman",
-            leftIndent=10,
-            spaceAfter=4,
-        )
-
-        max_rows = max(len(col) for col in column_lists)
-        table_data = []
-        for row_idx in range(max_rows):
-            row = []
-            for col in column_lists:
-                if row_idx < len(col):
-                    row.append(Paragraph(f"• {col[row_idx]}", bullet_style))
-                else:
-                    row.append("")
-            table_data.append(row)
-
-        skill_table = Table(
-            table_data,
-            colWidths=[2.1 * inch, 2.1 * inch, 2.1 * inch],
-            hAlign="LEFT",
-        )
-        skill_table.setStyle(
-            TableStyle(
-                [
-                    ("LEFTPADDING", (0, 0), (-1, -1), 6),
-                    ("RIGHTPADDING", (0, 0), (-1, -1), 6),
-                    ("TOPPADDING", (0, 0), (-1, -1), 2),
-                    ("BOTTOMPADDING", (0, 0), (-1, -1), 2),
-                    ("VALIGN", (0, 0), (-1, -1), "TOP"),
-                ]
-            )
-        )
-        elements.append(skill_table)
+        bullet_style = self.styles["SkillBullet"]
+        font_name = bullet_style.fontName
+        font_size = bullet_style.fontSize
+        text_width = _SKILL_COLUMN_WIDTH - 2 * _SKILL_CELL_H_PADDING - bullet_style.leftIndent
+
+        # Row r holds skills 3r..3r+2, i.e. round-robin across the columns;
+        # the last row is padded with empty cells
+        rows = [
+            [
+                _wrap_text(f"• {name}", font_name, font_size, text_width) if name is not None else []
+                for name in row
+            ]
+            for row in zip_longest(*[iter(skill_names)] * columns)
+        ]
+
+        elements.append(SkillColumnsFlowable(rows, bullet_style))
         elements.append(Spacer(1, 0.1 * inch))
         return elements
 
@@ -13,7 +13,7 @@ class TechnicalSkillsExtractor:
     """Extract technical skills from text using LLM."""
     
     # Technical skill categories
-    TECHNICAL_CATEGORIES = [
+    TECHNICAL_CATEGORIES = frozenset({
         SkillCategory.PROGRAMMING_LANGUAGES,
         SkillCategory.FRAMEWORKS_LIBRARIES,
         SkillCategory.TOOLS_PLATFORMS,
@@ -25,7 +25,7 @@ class TechnicalSkillsExtractor:
         SkillCategory.BLOCKCHAIN,
         SkillCategory.CYBERSECURITY,
         SkillCategory.DATA_SCIENCE,
-    ]
+    })
     
     @staticmethod
     def extract_skills(text: str) -> Tuple[List[Skill], Optional[str]]:
@@ -12,21 +12,24 @@ class SoftSkillsExtractor:
     """Extract soft skills, education, and certifications from text using LLM."""
     
     # Soft skill categories
-    SOFT_SKILL_CATEGORIES = [
+    SOFT_SKILL_CATEGORIES = frozenset({
         SkillCategory.LEADERSHIP,
         SkillCategory.COMMUNICATION,
         SkillCategory.COLLABORATION,
         SkillCategory.PROBLEM_SOLVING,
         SkillCategory.ANALYTICAL_THINKING,
-    ]
+    })
     
     # Methodology categories
-    METHODOLOGY_CATEGORIES = [
+    METHODOLOGY_CATEGORIES = frozenset({
         SkillCategory.AGILE,
         SkillCategory.SCRUM,
         SkillCategory.CI_CD,
         SkillCategory.DESIGN_THINKING,
-    ]
+    })
+    
+    # Categories kept by _validate_soft_skills
+    VALID_CATEGORIES = SOFT_SKILL_CATEGORIES | METHODOLOGY_CATEGORIES
     
     @staticmethod
     def extract_soft_skills(text: str) -> Tuple[List[Skill], Optional[str]]:
@@ -347,7 +350,7 @@ class SoftSkillsExtractor:
         
         for skill in skills:
             # Check if skill is in soft skill or methodology categories
-            if skill.category not in SoftSkillsExtractor.SOFT_SKILL_CATEGORIES + SoftSkillsExtractor.METHODOLOGY_CATEGORIES:
+            if skill.category not in SoftSkillsExtractor.VALID_CATEGORIES:
                 continue
             
             # Use the same normalization as skill matching for consistency
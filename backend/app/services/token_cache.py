@@ -0,0 +1,112 @@
+"""
+In-process cache for verified JWT payloads.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+from app.config import settings
+
+
+# Sentinel stored for tokens that failed verification (negative cache)
+_INVALID = object()
+
+
+class TokenCache:
+    """Bounded LRU cache of verified token payloads with short TTLs."""
+
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        ttl_seconds: float = 5.0,
+        negative_ttl_seconds: float = 1.0
+    ):
+        """
+        Initialize token cache.
+
+        Args:
+            max_entries: Maximum number of cached tokens before LRU eviction
+            ttl_seconds: Lifetime of a cached valid payload
+            negative_ttl_seconds: Lifetime of a cached verification failure (0 disables)
+        """
+        self._entries: "OrderedDict[bytes, Tuple[object, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        """Hash the token so raw credentials are never kept as dict keys."""
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def lookup(self, token: str) -> Tuple[bool, Optional[dict]]:
+        """
+        Look up a token.
+
+        Args:
+            token: Raw JWT string
+
+        Returns:
+            Tuple of (hit, payload). On a negative-cache hit the payload is None.
+        """
+        key = self._key(token)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            value, expires_at = entry
+            if now >= expires_at:
+                del self._entries[key]
+                return False, None
+            self._entries.move_to_end(key)
+        if value is _INVALID:
+            return True, None
+        return True, value
+
+    def store(self, token: str, payload: Optional[dict]) -> None:
+        """
+        Cache the result of verifying a token.
+
+        Args:
+            token: Raw JWT string
+            payload: Decoded payload, or None if verification failed
+        """
+        now = time.time()
+        if payload is None:
+            if self.negative_ttl_seconds <= 0:
+                # Negative caching disabled
+                return
+            value = _INVALID
+            expires_at = now + self.negative_ttl_seconds
+        else:
+            value = payload
+            expires_at = now + self.ttl_seconds
+            exp = payload.get("exp")
+            if isinstance(exp, (int, float)):
+                # Never outlive the token's own expiry
+                expires_at = min(expires_at, exp)
+            if expires_at <= now:
+                return
+
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all cached entries."""
+        with self._lock:
+            self._entries.clear()
+
+
+# Global token cache instance
+token_cache = TokenCache(
+    max_entries=settings.jwt_verify_cache_max_entries,
+    ttl_seconds=settings.jwt_verify_cache_ttl_seconds,
+    negative_ttl_seconds=settings.jwt_verify_negative_cache_ttl_seconds
+)
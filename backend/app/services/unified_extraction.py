@@ -233,7 +233,7 @@ class UnifiedSkillExtractor:
             return None, "File not found or session expired"
         
         # Get parsed text
-        parsed_text = file_data.get("parsed_text")
+        parsed_text = file_storage.get_parsed_text(file_id)
         
         if not parsed_text:
             # Try to parse the file first
@@ -242,9 +242,7 @@ class UnifiedSkillExtractor:
             if not success:
                 return None, parse_error or "Failed to parse file"
             
-            # Get updated file data
-            file_data = file_storage.get_file(file_id)
-            parsed_text = file_data.get("parsed_text")
+            parsed_text = file_storage.get_parsed_text(file_id)
             
             if not parsed_text:
                 return None, "Could not extract text from file"
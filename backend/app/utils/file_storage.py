@@ -2,18 +2,49 @@
 In-memory file storage for session-based file handling.
 """
 from typing import Dict, Optional, Union
+import os
+import shutil
+import tempfile
 import uuid
 from datetime import datetime, timedelta
 from app.models.schemas import ResumeData, JobDescription
 
 
 class FileStorage:
-    """In-memory file storage for session-based processing."""
+    """In-memory file storage for session-based processing.
     
-    def __init__(self):
-        """Initialize file storage."""
+    Parsed text is kept on disk (one file per file_id) so large documents
+    don't stay pinned in the metadata dict; only its length is held in memory.
+    """
+    
+    def __init__(self, parsed_text_dir: Optional[str] = None):
+        """
+        Initialize file storage.
+        
+        Args:
+            parsed_text_dir: Directory for parsed text. Defaults to a fresh
+                per-process temp directory, removed again by close().
+        """
         self._files: Dict[str, dict] = {}
         self._session_timeout = timedelta(hours=1)  # 1 hour session timeout
+        self._owns_parsed_text_dir = parsed_text_dir is None
+        if parsed_text_dir is None:
+            # Per-process, so files left behind by an earlier process never pile up here
+            self._parsed_text_dir = tempfile.mkdtemp(prefix="skillsync_parsed_")
+        else:
+            self._parsed_text_dir = parsed_text_dir
+            os.makedirs(self._parsed_text_dir, exist_ok=True)
+    
+    def _parsed_text_path(self, file_id: str) -> str:
+        """Get the on-disk location of a file's parsed text."""
+        return os.path.join(self._parsed_text_dir, f"{file_id}.txt")
+    
+    def _remove_parsed_text(self, file_id: str) -> None:
+        """Delete a file's parsed text from disk, if present."""
+        try:
+            os.remove(self._parsed_text_path(file_id))
+        except FileNotFoundError:
+            pass
     
     def store_file(
         self,
@@ -46,7 +77,7 @@ class FileStorage:
             "file_size": file_size,
             "source_type": source_type,
             "uploaded_at": datetime.now(),
-            "parsed_text": None,  # Will be populated after parsing
+            "parsed_text_length": None,  # Set after parsing; text itself lives on disk
             "parsed_data": None,  # Will be populated after extraction
         }
         
@@ -60,16 +91,79 @@ class FileStorage:
             # Check if session expired
             if datetime.now() - file_data["uploaded_at"] > self._session_timeout:
                 del self._files[file_id]
+                self._remove_parsed_text(file_id)
                 return None
             return file_data
         return None
     
+    def store_text(
+        self,
+        file_id: str,
+        filename: str,
+        text: str,
+        source_type: str = "resume"
+    ) -> dict:
+        """
+        Store plain text input as an already-parsed txt file.
+        
+        The text is written straight to the parsed-text file; no bytes copy is
+        kept as `content`, since parsed files are never parsed again.
+        
+        Args:
+            file_id: Unique file identifier
+            filename: Filename for reference
+            text: Cleaned text content
+            source_type: Type of text (resume or job_description)
+            
+        Returns:
+            File metadata dictionary
+        """
+        # UTF-8 size without encoding when the text is pure ASCII
+        file_size = len(text) if text.isascii() else len(text.encode("utf-8"))
+        file_data = self.store_file(
+            file_id=file_id,
+            filename=filename,
+            file_type="txt",
+            content=b"",
+            file_size=file_size,
+            source_type=source_type
+        )
+        self.update_file_text(file_id, text)
+        return file_data
+    
     def update_file_text(self, file_id: str, parsed_text: str) -> bool:
         """Update parsed text for a file."""
-        if file_id in self._files:
-            self._files[file_id]["parsed_text"] = parsed_text
-            return True
-        return False
+        if file_id not in self._files:
+            return False
+        path = self._parsed_text_path(file_id)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(parsed_text)
+        os.replace(tmp_path, path)
+        self._files[file_id]["parsed_text_length"] = len(parsed_text)
+        return True
+    
+    def get_parsed_text(self, file_id: str) -> Optional[str]:
+        """Get parsed text for a file, or None if it hasn't been parsed."""
+        file_data = self.get_file(file_id)
+        if not file_data or file_data["parsed_text_length"] is None:
+            return None
+        try:
+            with open(self._parsed_text_path(file_id), "r", encoding="utf-8") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+    
+    def get_parsed_preview(self, file_id: str, max_chars: int = 500) -> Optional[str]:
+        """Get the first `max_chars` characters of a file's parsed text."""
+        file_data = self.get_file(file_id)
+        if not file_data or file_data["parsed_text_length"] is None:
+            return None
+        try:
+            with open(self._parsed_text_path(file_id), "r", encoding="utf-8") as f:
+                return f.read(max_chars)
+        except FileNotFoundError:
+            return None
     
     def update_file_data(self, file_id: str, parsed_data: Union[ResumeData, JobDescription]) -> bool:
         """Update parsed data for a file."""
@@ -82,6 +176,7 @@ class FileStorage:
         """Delete file from storage."""
         if file_id in self._files:
             del self._files[file_id]
+            self._remove_parsed_text(file_id)
             return True
         return False
     
@@ -95,12 +190,19 @@ class FileStorage:
         
         for file_id in expired_ids:
             del self._files[file_id]
+            self._remove_parsed_text(file_id)
         
         return len(expired_ids)
     
     def get_file_count(self) -> int:
         """Get total number of stored files."""
         return len(self._files)
+    
+    def close(self) -> None:
+        """Forget all files and remove the parsed-text directory if this storage created it."""
+        self._files.clear()
+        if self._owns_parsed_text_dir:
+            shutil.rmtree(self._parsed_text_dir, ignore_errors=True)
 
 
 # Global file storage instance
@@ -3,9 +3,22 @@ File upload utilities for validation and processing.
 """
 import os
 import uuid
-from typing import Tuple, Optional
+from typing import Any, Tuple, Optional
 from fastapi import UploadFile, HTTPException
 from app.config import settings
+try:
+    import magic
+except ImportError:
+    # Fallback to signature checks if python-magic (libmagic) not available
+    magic = None
+
+# Bytes needed to identify a file by content
+SNIFF_BYTES = 2048
+
+_SNIFFED_MIME_TO_TYPE = {
+    "application/pdf": "pdf",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document": "docx",
+}
 
 
 def validate_file_extension(filename: str) -> Tuple[bool, Optional[str]]:
@@ -97,6 +110,64 @@ async def validate_upload_file(file: UploadFile) -> Tuple[bool, Optional[str], O
         return False, None, f"Error reading file: {str(e)}"
 
 
+def sniff_file_type(head: bytes) -> Optional[str]:
+    """
+    Identify a PDF or DOCX from its leading bytes rather than the client's claims.
+    
+    Args:
+        head: First bytes of the file (SNIFF_BYTES is enough)
+        
+    Returns:
+        "pdf", "docx", or None if the content isn't recognized as either
+    """
+    if magic is not None:
+        return _SNIFFED_MIME_TO_TYPE.get(magic.from_buffer(head, mime=True))
+    
+    if head.startswith(b"%PDF-"):
+        return "pdf"
+    # DOCX is a ZIP container whose first entry is normally [Content_Types].xml
+    if head.startswith(b"PK\x03\x04") and b"[Content_Types].xml" in head:
+        return "docx"
+    return None
+
+
+async def read_upload_limited(
+    file: UploadFile,
+    chunk_size: int = 64 * 1024,
+    hasher: Optional[Any] = None
+) -> Tuple[Optional[bytes], Optional[str]]:
+    """
+    Read an uploaded file in chunks, stopping as soon as it exceeds the size limit.
+    
+    Oversized uploads are rejected after reading just past the limit instead
+    of being pulled into memory in full.
+    
+    Args:
+        file: FastAPI UploadFile object
+        chunk_size: Bytes to read per chunk
+        hasher: Optional hashlib object updated with each chunk as it is read
+        
+    Returns:
+        Tuple of (content, error_message)
+    """
+    max_size_bytes = settings.max_file_size_mb * 1024 * 1024
+    chunks = []
+    file_size = 0
+    
+    while True:
+        chunk = await file.read(chunk_size)
+        if not chunk:
+            break
+        file_size += len(chunk)
+        if file_size > max_size_bytes:
+            return None, f"File exceeds maximum allowed size ({settings.max_file_size_mb} MB)"
+        if hasher is not None:
+            hasher.update(chunk)
+        chunks.append(chunk)
+    
+    return b"".join(chunks), None
+
+
 def generate_file_id() -> str:
     """Generate a unique file ID."""
     return str(uuid.uuid4())
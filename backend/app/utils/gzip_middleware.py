@@ -0,0 +1,38 @@
+"""
+GZip middleware that leaves already-compressed media types alone.
+"""
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipMiddleware, GZipResponder
+from starlette.types import Message, Receive, Scope, Send
+
+
+# PDF and DOCX are compressed internally; gzipping them only burns CPU
+PRECOMPRESSED_MEDIA_TYPES = frozenset({
+    "application/pdf",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+})
+
+
+class SelectiveGZipResponder(GZipResponder):
+    """GZipResponder that passes precompressed media types through unchanged."""
+
+    async def send_with_gzip(self, message: Message) -> None:
+        await super().send_with_gzip(message)
+        if message["type"] == "http.response.start":
+            media_type = Headers(raw=message["headers"]).get("content-type", "").partition(";")[0]
+            if media_type.strip().lower() in PRECOMPRESSED_MEDIA_TYPES:
+                # Reuse the responder's pass-through path for pre-encoded bodies
+                self.content_encoding_set = True
+
+
+class SelectiveGZipMiddleware(GZipMiddleware):
+    """GZipMiddleware that skips responses listed in PRECOMPRESSED_MEDIA_TYPES."""
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and "gzip" in Headers(scope=scope).get("Accept-Encoding", ""):
+            responder = SelectiveGZipResponder(
+                self.app, self.minimum_size, compresslevel=self.compresslevel
+            )
+            await responder(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
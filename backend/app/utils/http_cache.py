@@ -0,0 +1,24 @@
+"""
+Conditional request (ETag / If-None-Match) helpers.
+"""
+from typing import Optional
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check whether a client's If-None-Match header covers an ETag.
+    
+    Args:
+        if_none_match: Raw If-None-Match header value, if any
+        etag: Current quoted ETag of the resource
+        
+    Returns:
+        True if the client's cached copy is current (respond 304)
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison, as required for If-None-Match
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag.removeprefix("W/") for tag in candidates)
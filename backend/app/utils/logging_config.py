@@ -0,0 +1,39 @@
+"""
+Application logging setup.
+"""
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+_listener: Optional[QueueListener] = None
+
+
+def configure_logging(level: str = "INFO") -> None:
+    """
+    Route the `app` logger hierarchy through a queue.
+
+    Request handlers only enqueue records; a background listener thread does
+    the formatting and stream I/O. Safe to call more than once.
+
+    Args:
+        level: Log level name for the `app` loggers (e.g. "DEBUG", "WARNING")
+    """
+    global _listener
+    app_logger = logging.getLogger("app")
+    app_logger.setLevel(level.upper())
+    if _listener is not None:
+        return
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(
+        logging.Formatter("%(asctime)s %(levelname)s [%(name)s] %(message)s")
+    )
+
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+    app_logger.addHandler(QueueHandler(log_queue))
@@ -4,6 +4,48 @@ Text cleaning and normalization utilities.
 import re
 from typing import Optional
 
+# Common encoding errors and their ASCII replacements, as a str.translate table
+_ENCODING_FIXES = str.maketrans({
+    '\u2018': "'",  # Left single quotation mark
+    '\u2019': "'",  # Right single quotation mark
+    '\u201C': '"',  # Left double quotation mark
+    '\u201D': '"',  # Right double quotation mark
+    '\u2013': '-',  # En dash
+    '\u2014': '--',  # Em dash
+    '\u2026': '...',  # Horizontal ellipsis
+    '\u00A0': ' ',  # Non-breaking space
+})
+
+# Single-character replacements from _ENCODING_FIXES, keyed by character
+_ENCODING_REPLACEMENTS = {chr(code): fix for code, fix in _ENCODING_FIXES.items()}
+
+# Patterns used on every extracted document, compiled once at import
+_MULTI_SPACE_RE = re.compile(r' +')
+_EXCESS_NEWLINES_RE = re.compile(r'\n{3,}')
+# Anything but letters, numbers, whitespace and common punctuation/symbols
+_DISALLOWED_CHARS = r'[^\w\s\.\,\;\:\!\?\-\(\)\[\]\{\}\'\"\/\\\@\#\$\%\&\*\=\+\<\>]'
+# Whitespace runs other than a lone ' ' (which is already in canonical form)
+_COLLAPSIBLE_WHITESPACE = r'(?: \s|[^\S ])\s*'
+# One-pass equivalents of clean_text and remove_encoding_issues -> clean_text.
+# Alternatives are tried in order, so encoding fixes win over the disallowed class.
+_CLEAN_RE = re.compile(_COLLAPSIBLE_WHITESPACE + '|' + _DISALLOWED_CHARS)
+_CLEANUP_RE = re.compile(
+    _COLLAPSIBLE_WHITESPACE
+    + '|[' + ''.join(_ENCODING_REPLACEMENTS) + ']'
+    + '|' + _DISALLOWED_CHARS
+)
+
+
+def _clean_replacement(match: re.Match) -> str:
+    """Collapse a whitespace run to one space and drop anything else."""
+    return ' ' if match.group()[0].isspace() else ''
+
+
+def _cleanup_replacement(match: re.Match) -> str:
+    """Like _clean_replacement, but map encoding errors to their ASCII fix."""
+    matched = match.group()
+    return _ENCODING_REPLACEMENTS.get(matched, ' ' if matched[0].isspace() else '')
+
 
 def clean_text(text: str) -> str:
     """
@@ -18,20 +60,13 @@ def clean_text(text: str) -> str:
     if not text:
         return ""
     
-    # Normalize whitespace - replace multiple spaces/tabs/newlines with single space
-    text = re.sub(r'\s+', ' ', text)
-    
-    # Remove excessive line breaks
-    text = re.sub(r'\n{3,}', '\n\n', text)
-    
-    # Remove special characters that might interfere (keep alphanumeric, punctuation, and common symbols)
-    # Keep: letters, numbers, spaces, and common punctuation
-    text = re.sub(r'[^\w\s\.\,\;\:\!\?\-\(\)\[\]\{\}\'\"\/\\\@\#\$\%\&\*\=\+\<\>]', '', text)
+    # Single pass: collapse whitespace runs (including line breaks) to one space
+    # and remove special characters that might interfere (keep alphanumeric,
+    # punctuation, and common symbols)
+    text = _CLEAN_RE.sub(_clean_replacement, text)
     
     # Remove leading/trailing whitespace
-    text = text.strip()
-    
-    return text
+    return text.strip()
 
 
 def normalize_whitespace(text: str) -> str:
@@ -48,14 +83,13 @@ def normalize_whitespace(text: str) -> str:
         return ""
     
     # Replace multiple spaces with single space
-    text = re.sub(r' +', ' ', text)
+    text = _MULTI_SPACE_RE.sub(' ', text)
     
     # Normalize line breaks
-    text = re.sub(r'\r\n', '\n', text)
-    text = re.sub(r'\r', '\n', text)
+    text = text.replace('\r\n', '\n').replace('\r', '\n')
     
     # Remove excessive line breaks
-    text = re.sub(r'\n{3,}', '\n\n', text)
+    text = _EXCESS_NEWLINES_RE.sub('\n\n', text)
     
     return text.strip()
 
@@ -125,20 +159,25 @@ def remove_encoding_issues(text: str) -> str:
     if not text:
         return ""
     
-    # Replace common encoding errors
-    replacements = {
-        '\u2018': "'",  # Left single quotation mark
-        '\u2019': "'",  # Right single quotation mark
-        '\u201C': '"',  # Left double quotation mark
-        '\u201D': '"',  # Right double quotation mark
-        '\u2013': '-',  # En dash
-        '\u2014': '--',  # Em dash
-        '\u2026': '...',  # Horizontal ellipsis
-        '\u00A0': ' ',  # Non-breaking space
-    }
+    # Replace common encoding errors in a single pass
+    return text.translate(_ENCODING_FIXES)
+
+
+def clean_extracted_text(text: str) -> str:
+    """
+    Fix encoding issues and clean text extracted from a document.
     
-    for old, new in replacements.items():
-        text = text.replace(old, new)
+    Equivalent to remove_encoding_issues -> normalize_whitespace -> clean_text
+    in a single regex pass (clean_text already collapses all whitespace, which
+    makes normalize_whitespace redundant).
     
-    return text
-
+    Args:
+        text: Raw extracted text
+        
+    Returns:
+        Cleaned text
+    """
+    if not text:
+        return ""
+    
+    return _CLEANUP_RE.sub(_cleanup_replacement, text).strip()
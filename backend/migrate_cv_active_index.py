@@ -0,0 +1,49 @@
+"""
+Database migration script to index the active CV per user.
+This keeps only the newest active CV for any user that has several, then
+adds a unique partial index on user_cvs(user_id) WHERE is_active = 1.
+"""
+import sqlite3
+import os
+
+# Database path
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./data/skillsync.db")
+db_path = DATABASE_URL.replace("sqlite:///", "")
+
+if not os.path.exists(db_path):
+    print(f"Database file not found at {db_path}. Creating new database...")
+    from app.models.database import init_db
+    init_db()
+    print("Database initialized with new schema.")
+    exit(0)
+
+print(f"Migrating database at {db_path}...")
+
+conn = sqlite3.connect(db_path)
+cursor = conn.cursor()
+
+try:
+    # The unique index can't be built while a user has more than one active CV
+    cursor.execute(
+        "UPDATE user_cvs SET is_active = 0 "
+        "WHERE is_active = 1 AND id NOT IN ("
+        "  SELECT MAX(id) FROM user_cvs WHERE is_active = 1 GROUP BY user_id"
+        ")"
+    )
+    print(f"✓ Deactivated {cursor.rowcount} superseded CV(s)")
+    
+    cursor.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS ux_user_cvs_active_user "
+        "ON user_cvs (user_id) WHERE is_active = 1"
+    )
+    print("✓ ux_user_cvs_active_user index present")
+    
+    conn.commit()
+    print("\n✓ Database migration completed successfully!")
+    
+except sqlite3.Error as e:
+    print(f"\n✗ Error during migration: {e}")
+    conn.rollback()
+    raise
+finally:
+    conn.close()
@@ -0,0 +1,53 @@
+"""
+Database migration script to store CV files as raw bytes.
+This base64-decodes existing user_cvs.file_content values in place so they
+match the LargeBinary column (SQLite keeps BLOB values as-is even in a
+column originally declared TEXT, so no table rebuild is needed).
+"""
+import base64
+import binascii
+import sqlite3
+import os
+
+# Database path
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./data/skillsync.db")
+db_path = DATABASE_URL.replace("sqlite:///", "")
+
+if not os.path.exists(db_path):
+    print(f"Database file not found at {db_path}. Creating new database...")
+    from app.models.database import init_db
+    init_db()
+    print("Database initialized with new schema.")
+    exit(0)
+
+print(f"Migrating database at {db_path}...")
+
+conn = sqlite3.connect(db_path)
+cursor = conn.cursor()
+
+try:
+    # Only rows still holding base64 text need converting
+    cursor.execute("SELECT id, file_content FROM user_cvs WHERE typeof(file_content) = 'text'")
+    rows = cursor.fetchall()
+    
+    converted = 0
+    for cv_id, encoded in rows:
+        try:
+            raw = base64.b64decode(encoded, validate=True)
+        except binascii.Error:
+            print(f"✗ CV {cv_id} is not valid base64; left unchanged")
+            continue
+        cursor.execute("UPDATE user_cvs SET file_content = ? WHERE id = ?", (raw, cv_id))
+        converted += 1
+    
+    print(f"✓ Converted {converted} CV(s) to raw bytes")
+    
+    conn.commit()
+    print("\n✓ Database migration completed successfully!")
+    
+except sqlite3.Error as e:
+    print(f"\n✗ Error during migration: {e}")
+    conn.rollback()
+    raise
+finally:
+    conn.close()
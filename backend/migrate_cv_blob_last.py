@@ -0,0 +1,76 @@
+"""
+Database migration script to move user_cvs.file_content to the last column.
+SQLite stores a row's columns in declaration order, so metadata columns placed
+after a large blob are only reachable by walking the blob's overflow pages.
+The table is rebuilt with the blob last and its indexes recreated.
+"""
+import sqlite3
+import os
+
+# Database path
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./data/skillsync.db")
+db_path = DATABASE_URL.replace("sqlite:///", "")
+
+if not os.path.exists(db_path):
+    print(f"Database file not found at {db_path}. Creating new database...")
+    from app.models.database import init_db
+    init_db()
+    print("Database initialized with new schema.")
+    exit(0)
+
+print(f"Migrating database at {db_path}...")
+
+# Every column except file_content, in their new order
+METADATA_COLUMNS = "id, user_id, filename, file_type, content_sha256, file_size, uploaded_at, is_active"
+
+conn = sqlite3.connect(db_path)
+cursor = conn.cursor()
+
+try:
+    cursor.execute("PRAGMA table_info(user_cvs)")
+    columns = [row[1] for row in cursor.fetchall()]
+    
+    if "content_sha256" not in columns:
+        print("✗ user_cvs has no content_sha256 column; run migrate_cv_sha256.py first")
+    elif columns[-1] == "file_content":
+        print("✓ file_content is already the last column")
+    else:
+        cursor.execute("""
+            CREATE TABLE user_cvs_new (
+                id INTEGER NOT NULL,
+                user_id INTEGER NOT NULL,
+                filename VARCHAR NOT NULL,
+                file_type VARCHAR NOT NULL,
+                content_sha256 VARCHAR(64),
+                file_size INTEGER NOT NULL,
+                uploaded_at DATETIME,
+                is_active BOOLEAN,
+                file_content BLOB NOT NULL,
+                PRIMARY KEY (id)
+            )
+        """)
+        cursor.execute(
+            f"INSERT INTO user_cvs_new ({METADATA_COLUMNS}, file_content) "
+            f"SELECT {METADATA_COLUMNS}, file_content FROM user_cvs"
+        )
+        print(f"✓ Copied {cursor.rowcount} CV(s)")
+        
+        cursor.execute("DROP TABLE user_cvs")
+        cursor.execute("ALTER TABLE user_cvs_new RENAME TO user_cvs")
+        cursor.execute("CREATE INDEX ix_user_cvs_user_id ON user_cvs (user_id)")
+        cursor.execute("CREATE INDEX ix_user_cvs_content_sha256 ON user_cvs (content_sha256)")
+        cursor.execute(
+            "CREATE UNIQUE INDEX ux_user_cvs_active_user "
+            "ON user_cvs (user_id) WHERE is_active = 1"
+        )
+        print("✓ user_cvs rebuilt with file_content last")
+    
+    conn.commit()
+    print("\n✓ Database migration completed successfully!")
+    
+except sqlite3.Error as e:
+    print(f"\n✗ Error during migration: {e}")
+    conn.rollback()
+    raise
+finally:
+    conn.close()
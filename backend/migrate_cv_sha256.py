@@ -0,0 +1,61 @@
+"""
+Database migration script to add content hashes to stored CVs.
+This adds user_cvs.content_sha256 (indexed) and backfills it for existing
+rows so re-uploading an identical file reuses the stored copy.
+"""
+import hashlib
+import sqlite3
+import os
+
+# Database path
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./data/skillsync.db")
+db_path = DATABASE_URL.replace("sqlite:///", "")
+
+if not os.path.exists(db_path):
+    print(f"Database file not found at {db_path}. Creating new database...")
+    from app.models.database import init_db
+    init_db()
+    print("Database initialized with new schema.")
+    exit(0)
+
+print(f"Migrating database at {db_path}...")
+
+conn = sqlite3.connect(db_path)
+cursor = conn.cursor()
+
+try:
+    cursor.execute("PRAGMA table_info(user_cvs)")
+    cv_columns = [col[1] for col in cursor.fetchall()]
+    
+    # Add content_sha256 to user_cvs if it doesn't exist
+    if 'content_sha256' not in cv_columns:
+        print("Adding content_sha256 column to user_cvs table...")
+        cursor.execute("ALTER TABLE user_cvs ADD COLUMN content_sha256 VARCHAR(64)")
+        print("✓ Added content_sha256 column")
+    else:
+        print("✓ content_sha256 column already exists")
+    
+    cursor.execute("CREATE INDEX IF NOT EXISTS ix_user_cvs_content_sha256 ON user_cvs (content_sha256)")
+    print("✓ ix_user_cvs_content_sha256 index present")
+    
+    # Backfill hashes (run migrate_cv_binary.py first so these are raw bytes)
+    cursor.execute("SELECT id, file_content FROM user_cvs WHERE content_sha256 IS NULL")
+    rows = cursor.fetchall()
+    for cv_id, content in rows:
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        cursor.execute(
+            "UPDATE user_cvs SET content_sha256 = ? WHERE id = ?",
+            (hashlib.sha256(content).hexdigest(), cv_id)
+        )
+    print(f"✓ Hashed {len(rows)} CV(s)")
+    
+    conn.commit()
+    print("\n✓ Database migration completed successfully!")
+    
+except sqlite3.Error as e:
+    print(f"\n✗ Error during migration: {e}")
+    conn.rollback()
+    raise
+finally:
+    conn.close()
@@ -0,0 +1,39 @@
+"""
+Database migration script to drop indexes that duplicate primary keys.
+The id columns were declared with index=True, which added ix_*_id indexes
+alongside the primary key (the rowid in SQLite). They were never used for
+lookups and only slowed down inserts.
+"""
+import sqlite3
+import os
+
+# Database path
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./data/skillsync.db")
+db_path = DATABASE_URL.replace("sqlite:///", "")
+
+if not os.path.exists(db_path):
+    print(f"Database file not found at {db_path}. Creating new database...")
+    from app.models.database import init_db
+    init_db()
+    print("Database initialized with new schema.")
+    exit(0)
+
+print(f"Migrating database at {db_path}...")
+
+conn = sqlite3.connect(db_path)
+cursor = conn.cursor()
+
+try:
+    for index_name in ("ix_users_id", "ix_user_profiles_id", "ix_user_cvs_id"):
+        cursor.execute(f"DROP INDEX IF EXISTS {index_name}")
+        print(f"✓ {index_name} removed")
+    
+    conn.commit()
+    print("\n✓ Database migration completed successfully!")
+    
+except sqlite3.Error as e:
+    print(f"\n✗ Error during migration: {e}")
+    conn.rollback()
+    raise
+finally:
+    conn.close()
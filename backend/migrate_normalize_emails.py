@@ -0,0 +1,54 @@
+"""
+Database migration script to normalize stored emails.
+This lowercases/strips existing users.email values and adds a unique index on
+lower(email) so lookups and uniqueness are case-insensitive.
+"""
+import sqlite3
+import os
+
+# Database path
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./data/skillsync.db")
+db_path = DATABASE_URL.replace("sqlite:///", "")
+
+if not os.path.exists(db_path):
+    print(f"Database file not found at {db_path}. Creating new database...")
+    from app.models.database import init_db
+    init_db()
+    print("Database initialized with new schema.")
+    exit(0)
+
+print(f"Migrating database at {db_path}...")
+
+conn = sqlite3.connect(db_path)
+cursor = conn.cursor()
+
+try:
+    # Refuse to continue if normalizing would merge two accounts
+    cursor.execute(
+        "SELECT lower(trim(email)), COUNT(*) FROM users "
+        "GROUP BY lower(trim(email)) HAVING COUNT(*) > 1"
+    )
+    duplicates = cursor.fetchall()
+    if duplicates:
+        print("✗ Found accounts that differ only by email case; resolve these first:")
+        for email, count in duplicates:
+            print(f"   {email} ({count} rows)")
+        exit(1)
+    
+    # Normalize stored emails
+    cursor.execute("UPDATE users SET email = lower(trim(email)) WHERE email != lower(trim(email))")
+    print(f"✓ Normalized {cursor.rowcount} email(s)")
+    
+    # Add functional unique index
+    cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS ix_users_email_lower ON users (lower(email))")
+    print("✓ ix_users_email_lower index present")
+    
+    conn.commit()
+    print("\n✓ Database migration completed successfully!")
+    
+except sqlite3.Error as e:
+    print(f"\n✗ Error during migration: {e}")
+    conn.rollback()
+    raise
+finally:
+    conn.close()
@@ -0,0 +1,38 @@
+"""
+Unit tests for the failed-attempt limiter.
+"""
+import pytest
+from app.services.attempt_limiter import FailedAttemptLimiter
+
+
+class TestFailedAttemptLimiter:
+    """Test cases for FailedAttemptLimiter."""
+
+    def test_blocks_after_max_failures(self):
+        """Test that a key is blocked once it reaches the failure limit."""
+        limiter = FailedAttemptLimiter(max_failures=3, window_seconds=60)
+        key = ("127.0.0.1", "a@example.com")
+
+        for _ in range(2):
+            limiter.record_failure(key)
+        assert limiter.is_blocked(key) is False
+
+        limiter.record_failure(key)
+        assert limiter.is_blocked(key) is True
+
+    def test_keys_are_independent(self):
+        """Test that failures for one caller don't block another."""
+        limiter = FailedAttemptLimiter(max_failures=1, window_seconds=60)
+        limiter.record_failure(("127.0.0.1", "a@example.com"))
+
+        assert limiter.is_blocked(("127.0.0.1", "b@example.com")) is False
+        assert limiter.is_blocked(("10.0.0.1", "a@example.com")) is False
+
+    def test_reset_clears_failures(self):
+        """Test that a successful attempt resets the counter."""
+        limiter = FailedAttemptLimiter(max_failures=1, window_seconds=60)
+        key = ("127.0.0.1", "a@example.com")
+        limiter.record_failure(key)
+        limiter.reset(key)
+
+        assert limiter.is_blocked(key) is False
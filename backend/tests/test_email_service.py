@@ -0,0 +1,69 @@
+"""
+Unit tests for the SMTP connection pool.
+"""
+import smtplib
+import pytest
+from email.message import EmailMessage
+from app.services.email_service import SMTPConnectionPool
+
+
+class FakeSMTP:
+    """In-memory stand-in for an authenticated smtplib.SMTP connection."""
+
+    def __init__(self, drop_first_send: bool = False):
+        self.sent = []
+        self.closed = False
+        self.drop_first_send = drop_first_send
+
+    def send_message(self, msg):
+        if self.drop_first_send:
+            self.drop_first_send = False
+            raise smtplib.SMTPServerDisconnected("idle timeout")
+        self.sent.append(msg)
+
+    def quit(self):
+        self.closed = True
+
+    def close(self):
+        self.closed = True
+
+
+class TestSMTPConnectionPool:
+    """Test cases for SMTPConnectionPool."""
+
+    def test_reuses_connection(self):
+        """Test that consecutive sends share one connection."""
+        connections = []
+        pool = SMTPConnectionPool(lambda: connections.append(FakeSMTP()) or connections[-1])
+
+        pool.send_message(EmailMessage())
+        pool.send_message(EmailMessage())
+
+        assert len(connections) == 1
+        assert len(connections[0].sent) == 2
+
+    def test_reconnects_when_server_dropped_connection(self):
+        """Test that a dropped connection is replaced and the send retried."""
+        connections = [FakeSMTP(drop_first_send=True), FakeSMTP()]
+        pool = SMTPConnectionPool(lambda: connections.pop(0))
+        stale = connections[0]
+        fresh = connections[1]
+
+        pool.send_message(EmailMessage())
+
+        assert stale.closed is True
+        assert len(fresh.sent) == 1
+
+    def test_expired_idle_connection_is_not_reused(self):
+        """Test that connections idle past the timeout are closed instead of reused."""
+        connections = []
+        pool = SMTPConnectionPool(
+            lambda: connections.append(FakeSMTP()) or connections[-1],
+            idle_timeout_seconds=0
+        )
+
+        pool.send_message(EmailMessage())
+        pool.send_message(EmailMessage())
+
+        assert len(connections) == 2
+        assert connections[0].closed is True
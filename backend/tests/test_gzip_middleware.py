@@ -0,0 +1,39 @@
+"""
+Unit tests for the selective GZip middleware.
+"""
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import Response
+from starlette.routing import Route
+from starlette.testclient import TestClient
+from app.utils.gzip_middleware import SelectiveGZipMiddleware
+
+
+BODY = b"x" * 2000
+
+
+def _app(media_type: str) -> Starlette:
+    """Build a one-route app that returns BODY with the given media type."""
+    app = Starlette(routes=[Route("/", lambda request: Response(BODY, media_type=media_type))])
+    app.add_middleware(SelectiveGZipMiddleware, minimum_size=500)
+    return app
+
+
+class TestSelectiveGZipMiddleware:
+    """Test cases for SelectiveGZipMiddleware."""
+
+    def test_compresses_text(self):
+        """Test that ordinary responses are still gzipped."""
+        response = TestClient(_app("application/json")).get("/", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.content == BODY
+
+    @pytest.mark.parametrize("media_type", [
+        "application/pdf",
+        "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    ])
+    def test_skips_precompressed_types(self, media_type):
+        """Test that PDF and DOCX bodies pass through without Content-Encoding."""
+        response = TestClient(_app(media_type)).get("/", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in response.headers
+        assert response.content == BODY
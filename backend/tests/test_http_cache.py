@@ -0,0 +1,20 @@
+"""
+Unit tests for conditional request helpers.
+"""
+import pytest
+from app.utils.http_cache import etag_matches
+
+
+class TestEtagMatches:
+    """Test cases for etag_matches."""
+
+    def test_matches_any_listed_tag(self):
+        """Test that a tag anywhere in the header list matches, weak or strong."""
+        assert etag_matches('"a", "b"', '"b"')
+        assert etag_matches('W/"b"', '"b"')
+        assert etag_matches("*", '"b"')
+
+    def test_no_match(self):
+        """Test that a missing or different header does not match."""
+        assert not etag_matches(None, '"b"')
+        assert not etag_matches('"a"', '"b"')
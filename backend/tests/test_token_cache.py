@@ -0,0 +1,52 @@
+"""
+Unit tests for the verified-token cache.
+"""
+import time
+import pytest
+from app.services.token_cache import TokenCache
+
+
+class TestTokenCache:
+    """Test cases for TokenCache."""
+
+    def test_miss_then_hit(self):
+        """Test that a stored payload is returned on the next lookup."""
+        cache = TokenCache(ttl_seconds=60)
+        payload = {"sub": "1", "exp": time.time() + 3600}
+
+        assert cache.lookup("token-a") == (False, None)
+        cache.store("token-a", payload)
+        assert cache.lookup("token-a") == (True, payload)
+
+    def test_negative_cache(self):
+        """Test that invalid tokens are remembered as failures."""
+        cache = TokenCache(negative_ttl_seconds=60)
+        cache.store("bad-token", None)
+
+        assert cache.lookup("bad-token") == (True, None)
+
+    def test_negative_cache_disabled(self):
+        """Test that failures are not cached when the negative TTL is zero."""
+        cache = TokenCache(negative_ttl_seconds=0)
+        cache.store("bad-token", None)
+
+        assert cache.lookup("bad-token") == (False, None)
+
+    def test_entry_never_outlives_token_exp(self):
+        """Test that an already-expired token is not cached."""
+        cache = TokenCache(ttl_seconds=60)
+        cache.store("expired", {"sub": "1", "exp": time.time() - 1})
+
+        assert cache.lookup("expired") == (False, None)
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted first."""
+        cache = TokenCache(max_entries=2, ttl_seconds=60)
+        cache.store("a", {"sub": "1"})
+        cache.store("b", {"sub": "2"})
+        cache.lookup("a")
+        cache.store("c", {"sub": "3"})
+
+        assert cache.lookup("a")[0] is True
+        assert cache.lookup("b")[0] is False
+        assert cache.lookup("c")[0] is True